@@ -0,0 +1,354 @@
+import os
+import json
+import time
+import functools
+import itertools
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Dict, Optional
+
+from github import Github, Issue, Repository
+
+# Issue, label and pull request storage behind the agent tools. A backend
+# exchanges plain dicts: an issue is {number, title, body, state, labels},
+# plus {comments} when read with ``get_issues``. Errors are raised, the tool
+# layer does not catch them.
+
+def _issue_dict(iss: Issue.Issue) -> Dict:
+    return {
+        "number": iss.number,
+        "title": iss.title,
+        "body": iss.body or "",
+        "state": iss.state,
+        "labels": [l.name for l in iss.labels],
+    }
+
+def _local_issue(iss: Dict) -> Dict:
+    # copies: callers must not be able to edit the store
+    return {
+        "number": iss["number"],
+        "title": iss["title"],
+        "body": iss["body"],
+        "state": iss["state"],
+        "labels": list(iss["labels"]),
+    }
+
+# ---------------------------------------------------------------------------
+# GitHub --------------------------------------------------------------------
+# ---------------------------------------------------------------------------
+
+# One GraphQL query returns a whole set of issues, aliased ``issue_<number>``,
+# instead of one REST request per issue and per field.
+_ISSUE_FIELDS = """
+    number title body state
+    labels(first: 50) { nodes { name } }
+    comments(last: $comments) { nodes { author { login } body createdAt } }
+"""
+
+class GithubBackend:
+    """The GitHub repository *repo_fullname*, reached through PyGithub.
+
+    The connection is opened on the first call, so creating the backend
+    stays offline. Reads go through an in-process issue cache: within
+    ``ttl`` seconds they are served from memory. Past it, an issue fetched
+    on its own is revalidated with a conditional request (its ETag), which
+    costs no rate limit when GitHub answers 304 Not Modified; an issue only
+    seen in a listing carries the listing's ETag, so it is fetched again
+    instead, and so are listings. Every write drops the issues it touches.
+    """
+
+    ttl = 30.0
+
+    def __init__(self, repo_fullname: str):
+        self.repo_fullname = repo_fullname
+        self._connect_lock = threading.Lock()
+        self._issue_cache: Dict[int, tuple] = {}
+        self._issues_snapshot: Dict[tuple, tuple] = {}
+
+    @functools.cached_property
+    def _connection(self) -> Repository.Repository:
+        token = os.environ.get("GH_TOKEN")
+        if not token:
+            raise EnvironmentError("GH_TOKEN environment variable is required")
+        return Github(token).get_repo(self.repo_fullname)
+
+    @property
+    def repo(self) -> Repository.Repository:
+        # the lock makes concurrent first calls share a single connection
+        with self._connect_lock:
+            return self._connection
+
+    @functools.cached_property
+    def _default_branch(self) -> str:
+        return self.repo.default_branch
+
+    def default_branch(self) -> str:
+        return self._default_branch
+
+    # ----------- cache ----------------------------------------
+
+    def _issue(self, number: int) -> Issue.Issue:
+        """Return issue *number* from the cache, fetching or revalidating it if needed."""
+        fetched_at, iss, own_etag = self._issue_cache.get(number, (0.0, None, False))
+        if iss is not None and time.monotonic() - fetched_at <= self.ttl:
+            return iss
+        if own_etag:
+            iss.update()  # If-None-Match: refreshed in place only if it changed
+        else:
+            iss = self.repo.get_issue(number)
+        self._issue_cache[number] = (time.monotonic(), iss, True)
+        return iss
+
+    def _issues(
+        self,
+        state: str,
+        label: Optional[str] = None,
+        since: Optional[datetime] = None,
+        limit: Optional[int] = None,
+    ) -> List[Issue.Issue]:
+        """Return the issues matching the query, listed at most once per ``ttl``.
+
+        Filters are applied by the API and only the pages needed for *limit*
+        issues are fetched.
+        """
+        query = (state, label, since, limit)
+        fetched_at, issues = self._issues_snapshot.get(query, (0.0, None))
+        if issues is None or time.monotonic() - fetched_at > self.ttl:
+            filters = {"state": state}
+            if label:
+                filters["labels"] = [label]
+            if since:
+                filters["since"] = since
+            issues = list(itertools.islice(self.repo.get_issues(**filters), limit))
+            self._issues_snapshot[query] = (time.monotonic(), issues)
+            for iss in issues:
+                # built from the listing's response: its ETag is not the issue's
+                self._issue_cache[iss.number] = (time.monotonic(), iss, False)
+        return issues
+
+    def _forget_issue(self, number: Optional[int] = None) -> None:
+        """Invalidate issue *number* (if given) and the issue listings after a write."""
+        if number is not None:
+            self._issue_cache.pop(number, None)
+        self._issues_snapshot.clear()
+
+    # ----------- issues ---------------------------------------
+
+    def list_issues(self, state: str, label=None, since=None, limit=None) -> List[Dict]:
+        return [_issue_dict(iss) for iss in self._issues(state, label, since, limit)]
+
+    def get_issue(self, number: int) -> Dict:
+        return _issue_dict(self._issue(number))
+
+    def get_issues(self, numbers: List[int], comments: int = 3) -> List[Dict]:
+        if not numbers:
+            return []
+        owner, name = self.repo_fullname.split("/")
+        aliases = "\n".join(
+            f"issue_{int(n)}: issue(number: {int(n)}) {{ {_ISSUE_FIELDS} }}" for n in numbers
+        )
+        query = (
+            "query($owner: String!, $name: String!, $comments: Int!) {"
+            f" repository(owner: $owner, name: $name) {{ {aliases} }} }}"
+        )
+        _, data = self.repo.requester.graphql_query(
+            query, {"owner": owner, "name": name, "comments": comments}
+        )
+        repository = data["data"]["repository"]
+        issues = []
+        for n in numbers:
+            iss = repository[f"issue_{int(n)}"]
+            issues.append({
+                "number": iss["number"],
+                "title": iss["title"],
+                "body": iss["body"] or "",
+                "state": iss["state"].lower(),
+                "labels": [l["name"] for l in iss["labels"]["nodes"]],
+                "comments": [
+                    {
+                        "author": (c["author"] or {}).get("login"),
+                        "created_at": c["createdAt"],
+                        "body": c["body"],
+                    }
+                    for c in iss["comments"]["nodes"]
+                ],
+            })
+        return issues
+
+    def create_issue(self, title: str, body: str) -> int:
+        number = self.repo.create_issue(title=title, body=body).number
+        self._forget_issue()
+        return number
+
+    def comment_issue(self, number: int, comment: str) -> None:
+        self._issue(number).create_comment(comment)
+        self._forget_issue(number)
+
+    def close_issue(self, number: int) -> None:
+        self._issue(number).edit(state="closed")
+        self._forget_issue(number)
+
+    # ----------- labels ---------------------------------------
+
+    def list_labels(self) -> List[str]:
+        return [lbl.name for lbl in self.repo.get_labels()]
+
+    def add_label(self, number: int, label: str) -> List[str]:
+        # ensure label exists
+        try:
+            self.repo.get_label(label)
+        except Exception:
+            self.repo.create_label(name=label, color="ededed")
+
+        iss = self._issue(number)
+        iss.add_to_labels(label)
+        self._forget_issue(number)
+        return [l.name for l in iss.labels]
+
+    def remove_label(self, number: int, label: str) -> List[str]:
+        iss = self._issue(number)
+        # safe: GitHub API ignores if label isn't attached
+        iss.remove_from_labels(label)
+        self._forget_issue(number)
+        return [l.name for l in iss.labels]
+
+    # ----------- pull requests --------------------------------
+
+    def create_pull(self, title: str, body: str, head: str) -> None:
+        self.repo.create_pull(title=title, body=body, head=head, base=self.default_branch())
+
+# ---------------------------------------------------------------------------
+# Local file ----------------------------------------------------------------
+# ---------------------------------------------------------------------------
+
+class LocalBackend:
+    """Offline stand-in for GitHub, kept in the JSON file *path*.
+
+    The file holds ``{"default_branch", "labels", "issues", "pulls"}`` and
+    is created empty if missing; seed it with a copy of a previous session
+    to replay it. It is rewritten atomically after every write, so it can be
+    inspected while agents run.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        if self.path.exists():
+            self._data = json.loads(self.path.read_text(encoding="utf-8"))
+        else:
+            self._data = {}
+        self._data.setdefault("default_branch", "main")
+        self._data.setdefault("labels", [])
+        self._data.setdefault("issues", [])
+        self._data.setdefault("pulls", [])
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(self._data, indent=2), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    def _find(self, number: int) -> Dict:
+        for iss in self._data["issues"]:
+            if iss["number"] == number:
+                return iss
+        raise LookupError(f"Issue #{number} not found")
+
+    def _next_number(self) -> int:
+        # issues and pull requests share their numbering, as on GitHub
+        items = self._data["issues"] + self._data["pulls"]
+        return 1 + max((item["number"] for item in items), default=0)
+
+    @staticmethod
+    def _now() -> str:
+        return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+    def default_branch(self) -> str:
+        return self._data["default_branch"]
+
+    # ----------- issues ---------------------------------------
+
+    def list_issues(self, state: str, label=None, since=None, limit=None) -> List[Dict]:
+        if since is not None and since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        with self._lock:
+            issues = [
+                _local_issue(iss) for iss in sorted(self._data["issues"], key=lambda i: -i["number"])
+                if state in ("all", iss["state"])
+                and (label is None or label in iss["labels"])
+                and (since is None or datetime.fromisoformat(iss["updated_at"]) >= since)
+            ]
+        return issues[:limit]
+
+    def get_issue(self, number: int) -> Dict:
+        with self._lock:
+            return _local_issue(self._find(number))
+
+    def get_issues(self, numbers: List[int], comments: int = 3) -> List[Dict]:
+        with self._lock:
+            return [
+                {**_local_issue(iss), "comments": [dict(c) for c in iss["comments"][-comments:]] if comments else []}
+                for iss in map(self._find, numbers)
+            ]
+
+    def create_issue(self, title: str, body: str) -> int:
+        with self._lock:
+            number = self._next_number()
+            self._data["issues"].append({
+                "number": number, "title": title, "body": body, "state": "open",
+                "labels": [], "comments": [], "updated_at": self._now(),
+            })
+            self._save()
+        return number
+
+    def comment_issue(self, number: int, comment: str) -> None:
+        with self._lock:
+            iss = self._find(number)
+            iss["comments"].append({"author": None, "created_at": self._now(), "body": comment})
+            iss["updated_at"] = self._now()
+            self._save()
+
+    def close_issue(self, number: int) -> None:
+        with self._lock:
+            iss = self._find(number)
+            iss["state"] = "closed"
+            iss["updated_at"] = self._now()
+            self._save()
+
+    # ----------- labels ---------------------------------------
+
+    def list_labels(self) -> List[str]:
+        with self._lock:
+            return list(self._data["labels"])
+
+    def add_label(self, number: int, label: str) -> List[str]:
+        with self._lock:
+            iss = self._find(number)
+            if label not in self._data["labels"]:
+                self._data["labels"].append(label)
+            if label not in iss["labels"]:
+                iss["labels"].append(label)
+                iss["updated_at"] = self._now()
+            self._save()
+            return list(iss["labels"])
+
+    def remove_label(self, number: int, label: str) -> List[str]:
+        with self._lock:
+            iss = self._find(number)
+            if label in iss["labels"]:
+                iss["labels"].remove(label)
+                iss["updated_at"] = self._now()
+                self._save()
+            return list(iss["labels"])
+
+    # ----------- pull requests --------------------------------
+
+    def create_pull(self, title: str, body: str, head: str) -> None:
+        with self._lock:
+            number = self._next_number()
+            self._data["pulls"].append({
+                "number": number, "title": title, "body": body,
+                "head": head, "base": self.default_branch(), "updated_at": self._now(),
+            })
+            self._save()
@@ -0,0 +1,117 @@
+from typing import List
+
+from autogen_core.model_context import ChatCompletionContext
+from autogen_core.models import (
+    AssistantMessage,
+    FunctionExecutionResultMessage,
+    LLMMessage,
+    UserMessage,
+)
+
+# ---------------------------------------------------------------------------
+# Compacting model context --------------------------------------------------
+# ---------------------------------------------------------------------------
+
+# Rough token count: about 4 characters per token for English and code. It
+# only decides when to compact, and needs no tokenizer for the model.
+_CHARS_PER_TOKEN = 4
+
+def _shorten(text: str, max_chars: int) -> str:
+    if len(text) <= max_chars:
+        return text
+    half = max_chars // 2
+    return f"{text[:half]}\n[... {len(text) - 2 * half} characters elided from an old message ...]\n{text[-half:]}"
+
+def _compact(message: LLMMessage, max_chars: int) -> LLMMessage:
+    if isinstance(message, FunctionExecutionResultMessage):
+        return message.model_copy(update={"content": [
+            result.model_copy(update={"content": _shorten(result.content, max_chars)})
+            for result in message.content
+        ]})
+    if isinstance(message, (UserMessage, AssistantMessage)) and isinstance(message.content, str):
+        return message.model_copy(update={"content": _shorten(message.content, max_chars)})
+    return message
+
+def _tokens(messages: List[LLMMessage]) -> int:
+    return sum(len(str(m.content)) for m in messages) // _CHARS_PER_TOKEN
+
+def _pieces(message: LLMMessage) -> int:
+    # the texts _compact shortens one by one: one per tool result
+    return len(message.content) if isinstance(message, FunctionExecutionResultMessage) else 1
+
+def _last_turn(messages: List[LLMMessage]) -> int:
+    """Index of the last tool call request, or of the last message if there is none."""
+    for i in range(len(messages) - 1, -1, -1):
+        if isinstance(messages[i], AssistantMessage) and isinstance(messages[i].content, list):
+            return i
+    return len(messages) - 1
+
+def _dropped_note(count: int) -> UserMessage:
+    return UserMessage(
+        content=f"[... {count} earlier messages dropped to fit the context budget ...]",
+        source="context",
+    )
+
+class CompactingChatCompletionContext(ChatCompletionContext):
+    """Model context that keeps the prompt of an agent within *token_budget*.
+
+    The full history is stored; what the model sees is compacted in up to
+    three steps. Messages older than the *keep_recent* last ones are cut to
+    *max_chars* characters, head and tail kept: old tool results and file
+    dumps shrink first. If the prompt exceeds the budget, the recent
+    messages are cut too, to an even share of the budget. If it still does,
+    the oldest messages after the first one (the task) are dropped, but
+    never the last tool call and its results, nor the last message, nor a
+    tool result without its call.
+    """
+
+    def __init__(
+        self,
+        token_budget: int = 32_000,
+        keep_recent: int = 6,
+        max_chars: int = 2_000,
+        initial_messages: List[LLMMessage] | None = None,
+    ) -> None:
+        super().__init__(initial_messages)
+        self.token_budget = token_budget
+        self.keep_recent = keep_recent
+        self.max_chars = max_chars
+
+    async def get_messages(self) -> List[LLMMessage]:
+        if len(self._messages) <= 1:
+            return list(self._messages)
+        first, rest = self._messages[0], self._messages[1:]
+        split = max(len(rest) - self.keep_recent, 0)
+        old, recent = [_compact(m, self.max_chars) for m in rest[:split]], rest[split:]
+
+        if _tokens([first] + old + recent) > self.token_budget:
+            share = self.token_budget * _CHARS_PER_TOKEN // sum(map(_pieces, recent))
+            recent = [_compact(m, max(share, self.max_chars)) for m in recent]
+        body = old + recent
+
+        # the last tool call and its results are kept whole, or the agent
+        # would repeat its calls; so is the last message
+        turn = _last_turn(body)
+        end = turn + 1
+        while end < len(body) and isinstance(body[end], FunctionExecutionResultMessage):
+            end += 1
+        before, keep, after = body[:turn], body[turn:end], body[end:]
+        after, last = after[:-1], after[-1:]
+
+        dropped_before = dropped_after = 0
+        while (before or after) and _tokens([first] + before + keep + after + last) > self.token_budget:
+            if before:
+                before.pop(0)
+                dropped_before += 1
+                # results whose call was dropped would be rejected by the API
+                while before and isinstance(before[0], FunctionExecutionResultMessage):
+                    before.pop(0)
+                    dropped_before += 1
+            else:
+                after.pop(0)  # no tool call after the last one: text messages only
+                dropped_after += 1
+        if dropped_before:
+            before.insert(0, _dropped_note(dropped_before))
+        if dropped_after:
+            after.insert(0, _dropped_note(dropped_after))
+        return [first] + before + keep + after + last
@@ -1,5 +1,6 @@
 import os
 import asyncio
+import functools
 import argparse
 
 from autogen_agentchat.agents import AssistantAgent
@@ -9,23 +10,29 @@ from autogen_agentchat.conditions import MaxMessageTermination, TextMentionTermi
 from autogen_ext.code_executors.local import LocalCommandLineCodeExecutor
 from autogen_ext.tools.code_execution import PythonCodeExecutionTool
 
+from .context import CompactingChatCompletionContext
+from .selection import select_speaker
 from .utils import get_client, get_prompt
 
 from .tools import (
+    tree,
+    search,
     list_directories,
     list_files,
     read_file,
     create_directory,
     write_file,
-    list_issues,
-    get_issue_body,
-    comment_issue,
-    open_pull_request,
+    list_issues_async,
+    get_issue_body_async,
+    get_issues_async,
+    comment_issue_async,
+    open_pull_request_async,
     delete_file,
     diff,
     commit_and_push,
     insert_line,
     delete_line,
+    edit_lines,
     create_and_switch_branch,
 )
 
@@ -42,18 +49,23 @@ manager = AssistantAgent(
     model_client = get_client(),
     model_client_stream=True,
     system_message = get_prompt("manager"),
+    model_context = CompactingChatCompletionContext(token_budget=32_000),
     tools = [
+        tree,
+        search,
         list_directories,
         list_files,
         read_file,
         create_directory,
         write_file,
         insert_line,
+        edit_lines,
         delete_line,
-        list_issues,
-        get_issue_body,
-        comment_issue,
-        open_pull_request,
+        list_issues_async,
+        get_issue_body_async,
+        get_issues_async,
+        comment_issue_async,
+        open_pull_request_async,
         diff,
         commit_and_push,
         create_and_switch_branch
@@ -66,11 +78,15 @@ coder = AssistantAgent(
     model_client = get_client(),
     model_client_stream=True,
     system_message = get_prompt("coder"),
+    model_context = CompactingChatCompletionContext(token_budget=32_000),
     tools = [
+        tree,
+        search,
         list_directories,
         list_files,
         read_file,
         insert_line,
+        edit_lines,
         create_directory,
         write_file,
         delete_file,
@@ -85,7 +101,10 @@ tester = AssistantAgent(
     model_client = get_client(),
     model_client_stream=True,
     system_message = get_prompt("tester"),
+    model_context = CompactingChatCompletionContext(token_budget=32_000),
     tools = [
+        tree,
+        search,
         list_directories,
         list_files,
         read_file,
@@ -93,6 +112,7 @@ tester = AssistantAgent(
         delete_file,
         write_file,
         insert_line,
+        edit_lines,
         commit_and_push,
         PythonCodeExecutionTool(LocalCommandLineCodeExecutor(work_dir="coding")),
     ],
@@ -102,6 +122,11 @@ team = SelectorGroupChat(
     participants=[manager, coder, tester],
     allow_repeated_speaker=True,
     model_client = get_client("moonshotai/kimi-k2:free"),
+    selector_func = functools.partial(
+        select_speaker, manager=manager.name, team=(coder.name, tester.name)
+    ),
+    # the fallback selector only needs the gist of the recent turns
+    model_context = CompactingChatCompletionContext(token_budget=8_000, max_chars=500),
     selector_prompt = """Select an agent to perform next among :
     {roles}
 
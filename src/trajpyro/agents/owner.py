@@ -6,26 +6,29 @@ from autogen_agentchat.conditions import MaxMessageTermination, TextMentionTermi
 from autogen_agentchat.ui import Console
 from autogen_agentchat.teams import RoundRobinGroupChat
 
+from .context import CompactingChatCompletionContext
 from .utils import get_client
 # ------------------------------------------------------------
 # Tool layer – all exported GitHub helpers
 # ------------------------------------------------------------
 
 from .tools import (
+    tree,
     list_directories,
     list_files,
     read_file,
     create_directory,
     write_file,
-    list_issues,
-    get_issue_body,
-    create_issue,
-    comment_issue,
-    close_issue,
-    list_existing_labels,
-    get_labels,
-    add_label,
-    remove_label,
+    list_issues_async,
+    get_issue_body_async,
+    get_issues_async,
+    create_issue_async,
+    comment_issue_async,
+    close_issue_async,
+    list_existing_labels_async,
+    get_labels_async,
+    add_label_async,
+    remove_label_async,
 )
 
 # ------------------------------------------------------------
@@ -44,26 +47,29 @@ with open(_PROMPT_PATH, "r", encoding="utf-8") as _f:
 # ------------------------------------------------------------
 
 TOOLS = [
+    tree,
     list_directories,
     list_files,
     read_file,
     create_directory,
     write_file,
-    list_issues,
-    get_issue_body,
-    create_issue,
-    comment_issue,
-    close_issue,
-    list_existing_labels,
-    get_labels,
-    add_label,
-    remove_label,
+    list_issues_async,
+    get_issue_body_async,
+    get_issues_async,
+    create_issue_async,
+    comment_issue_async,
+    close_issue_async,
+    list_existing_labels_async,
+    get_labels_async,
+    add_label_async,
+    remove_label_async,
 ]
 
 agent = AssistantAgent(
     name = "owner",
     model_client = get_client(),
     system_message = SYSTEM_MSG,
+    model_context = CompactingChatCompletionContext(token_budget=32_000),
     # system_message = "You are product owner of this project. Write TERMINATE when task is done.",
     tools = TOOLS,
     # reflect_on_tool_use=True,
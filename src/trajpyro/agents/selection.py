@@ -0,0 +1,54 @@
+import re
+from typing import Sequence
+
+from autogen_agentchat.messages import BaseChatMessage, TextMessage, ToolCallSummaryMessage
+
+# ---------------------------------------------------------------------------
+# Rule-based speaker selection ----------------------------------------------
+# ---------------------------------------------------------------------------
+
+_DONE = re.compile(r"\bDONE\b")
+
+def _address_patterns(name: str) -> list[re.Pattern]:
+    # "@coder", a line or sentence opening with "coder:" / "**Coder**," or
+    # "I assign / hand this over to the coder"
+    return [
+        re.compile(rf"@{name}\b", re.IGNORECASE),
+        re.compile(rf"(?:^|[.!?]\s)[\s>#*-]*{name}\**\s*[:,]", re.IGNORECASE | re.MULTILINE),
+        re.compile(rf"\b(?:assign|delegat|hand|pass)\w*\b[^.\n]*\bto (?:the )?{name}\b", re.IGNORECASE),
+    ]
+
+def select_speaker(
+    messages: Sequence,
+    manager: str = "manager",
+    team: Sequence[str] = ("coder", "tester"),
+) -> str | None:
+    """Apply the turn-taking rules of the selector prompt locally.
+
+    The manager keeps the floor until they explicitly assign a task to one
+    team mate (``@coder``, ``coder: ...`` or "assign ... to the coder"),
+    who then keeps it until they write "DONE". A tool call leaves the floor
+    to the agent who made it. Returns ``None``, so that the selector model
+    decides, when the manager addresses several team mates or only
+    mentions one in passing.
+    """
+    chat = [m for m in messages if isinstance(m, BaseChatMessage)]
+    if not chat or chat[-1].source == "user":
+        return manager
+    last = chat[-1]
+    if isinstance(last, ToolCallSummaryMessage):
+        return last.source
+    if not isinstance(last, TextMessage):
+        return None
+    if last.source == manager:
+        addressed = [
+            name for name in team
+            if any(p.search(last.content) for p in _address_patterns(name))
+        ]
+        if len(addressed) == 1:
+            return addressed[0]
+        mentioned = any(re.search(rf"\b{name}\b", last.content, re.IGNORECASE) for name in team)
+        return None if addressed or mentioned else manager
+    if _DONE.search(last.content):
+        return manager
+    return last.source
@@ -1,37 +1,56 @@
 import os
+import shutil
+import hashlib
+import json
+import re
+import asyncio
+import functools
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Optional
-from typing_extensions import Annotated
+from typing import List, Dict, Literal, Optional
+from typing_extensions import Annotated, NotRequired, TypedDict
 
-from github import Github, Issue
 from git import Repo
 
+from .backends import GithubBackend, LocalBackend
+
 import subprocess
 
 # ---------------------------------------------------------------------------
-# Initialise GitHub handle ----------------------------------------------------
+# Issue backend -------------------------------------------------------------
 # ---------------------------------------------------------------------------
 
-_GH_TOKEN = os.environ.get("GH_TOKEN")
-if not _GH_TOKEN:
-    raise EnvironmentError("GH_TOKEN environment variable is required")
-
+# GH_BACKEND=github (default) works on the GitHub repository GH_REPO;
+# GH_BACKEND=local on the JSON file GH_LOCAL_STORE instead, so agent
+# sessions run, replay and get timed offline.
 _REPO_FULLNAME = os.environ.get("GH_REPO", "owner/project")  # fallback for local tests
+_LOCAL_STORE = os.environ.get("GH_LOCAL_STORE", os.path.join(".cache", "trajpyro", "github.json"))
+
+_backend_lock = threading.Lock()
+
+@functools.lru_cache(maxsize=None)
+def _make_backend():
+    kind = os.environ.get("GH_BACKEND", "github")
+    if kind == "github":
+        return GithubBackend(_REPO_FULLNAME)
+    if kind == "local":
+        return LocalBackend(_LOCAL_STORE)
+    raise EnvironmentError(f"Unknown GH_BACKEND {kind!r}, expected 'github' or 'local'")
 
-_g = Github(_GH_TOKEN)
-_repo = _g.get_repo(_REPO_FULLNAME)
-_default_branch = _repo.default_branch
+def _backend():
+    """Return the issue backend, created on the first issue tool call.
 
-# ─────────────────────────── Helper utilities ───────────────────────────
+    Importing this module stays offline, so filesystem-only agents start
+    instantly and work without a token.
+    """
+    with _backend_lock:
+        return _make_backend()
 
-def _issue_dict(iss: Issue.Issue) -> Dict:
-    return {
-        "number": iss.number,
-        "title": iss.title,
-        "body": iss.body or "",
-        "state": iss.state,
-        "labels": [l.name for l in iss.labels],
-    }
+def _issue_summary(iss: Dict) -> Dict:
+    return {key: iss[key] for key in ("number", "title", "labels")}
 
 # ─────────────────────────────────────────── FS helpers ──────────────────────
 
@@ -55,11 +74,344 @@ def list_files(
     files = [str(p) for p in paths if not p.is_dir()]
     return [f for f in files if not f.startswith(".")]
 
+# Directory listings of ``tree``, cached per directory and refreshed when the
+# mtime of the directory or of its .gitignore changes. File sizes are read
+# on every walk: a file rewritten in place (a log, program output) does not
+# touch its directory.
+_tree_cache: Dict[str, tuple] = {}
+
+def _gitignore_regex(pattern: str) -> re.Pattern:
+    """Compile a .gitignore glob into a regular expression matching whole paths.
+
+    ``*``, ``?`` and ``[...]`` stay within a path segment, ``**/`` matches
+    zero or more directories and a final ``/**`` everything inside.
+    """
+    out, i = [], 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i) and (i == 0 or pattern[i - 1] == "/"):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == len(pattern):
+            out.append("/.*")
+            i += 3
+        elif pattern[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            out.append("[^/]")
+            i += 1
+        elif pattern[i] == "[" and "]" in pattern[i + 2:]:
+            end = pattern.index("]", i + 2)
+            body = pattern[i + 1:end]
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            out.append("[" + body.replace("\\", "\\\\") + "]")
+            i = end + 1
+        elif pattern[i] == "\\" and i + 1 < len(pattern):
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return re.compile("".join(out) + r"\Z", re.DOTALL)
+
+def _gitignore_rules(directory: str) -> List[tuple]:
+    """Parse the .gitignore of *directory* into (regex, negate, dir_only, anchored, base) rules.
+
+    Covers the common subset of the syntax: comments, ``!`` negation, a
+    trailing ``/`` for directories, anchoring by a ``/``, ``*``, ``?``,
+    ``[...]`` and ``**``.
+    """
+    try:
+        text = Path(directory, ".gitignore").read_text(encoding="utf-8")
+    except OSError:
+        return []
+    rules = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        negate = line.startswith("!")
+        line = line.lstrip("!")
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        # a pattern with no inner "/" matches the name at any depth
+        anchored = "/" in line
+        rules.append((_gitignore_regex(line.lstrip("/")), negate, dir_only, anchored, directory))
+    return rules
+
+def _ignored(full_path: str, name: str, is_dir: bool, rules: List[tuple]) -> bool:
+    ignored = False
+    for regex, negate, dir_only, anchored, base in rules:
+        if dir_only and not is_dir:
+            continue
+        target = full_path[len(base) + 1:] if anchored else name
+        if regex.match(target):
+            ignored = not negate  # the last matching rule wins, as in git
+    return ignored
+
+def _scan(directory: str) -> tuple:
+    """Return the sorted (name, is_dir) entries and the .gitignore rules of *directory*."""
+    try:
+        ignore_mtime = os.stat(os.path.join(directory, ".gitignore")).st_mtime_ns
+    except OSError:
+        ignore_mtime = None
+    key = (os.stat(directory).st_mtime_ns, ignore_mtime)
+    cached = _tree_cache.get(directory)
+    if cached is None or cached[0] != key:
+        entries = []
+        with os.scandir(directory) as it:
+            for entry in it:
+                entries.append((entry.name, entry.is_dir(follow_symlinks=False)))
+        entries.sort(key=lambda e: (not e[1], e[0]))
+        cached = _tree_cache[directory] = (key, entries, _gitignore_rules(directory))
+    return cached[1], cached[2]
+
+def _walk(root: str, depth: Optional[int] = None, hidden: bool = False):
+    """Yield ``(level, full_path, name, is_dir, stat)`` below *root*, depth first.
+
+    Skips .git, dot entries unless *hidden*, and what the .gitignore files of
+    the walked directories and of their parents up to the repository root
+    ignore.
+    """
+    # .gitignore files of the parent directories, up to the repository root
+    rules, parent = [], root
+    while not os.path.exists(os.path.join(parent, ".git")) and parent != os.path.dirname(parent):
+        parent = os.path.dirname(parent)
+        rules = _gitignore_rules(parent) + rules
+
+    def walk(directory: str, level: int, rules: List[tuple]):
+        entries, own_rules = _scan(directory)
+        rules = rules + own_rules
+        for name, is_dir in entries:
+            full_path = os.path.join(directory, name)
+            if name == ".git" or (name.startswith(".") and not hidden):
+                continue
+            if _ignored(full_path, name, is_dir, rules):
+                continue
+            stat = None
+            if not is_dir:
+                try:
+                    stat = os.stat(full_path)
+                except OSError:
+                    continue  # removed since the scan, or a broken link
+            yield level, full_path, name, is_dir, stat
+            if is_dir and (depth is None or level + 1 < depth):
+                yield from walk(full_path, level + 1, rules)
+
+    yield from walk(root, 0, rules)
+
+def tree(
+    path: Annotated[str, "Directory path relative to root"] = ".",
+    depth: Annotated[int, "Number of directory levels to descend"] = 3,
+    hidden: Annotated[bool, "Also list entries starting with a dot"] = False,
+    max_entries: Annotated[int, "Maximum number of entries to return"] = 500,
+) -> str:
+    """Return the indented tree of *path* with file sizes in bytes, skipping files ignored by git."""
+    lines: List[str] = []
+    for level, _, name, is_dir, stat in _walk(os.path.abspath(path or "."), depth, hidden):
+        if len(lines) == max_entries:
+            lines.append(f"[... truncated after {max_entries} entries; list a subdirectory or lower depth ...]")
+            break
+        lines.append("  " * level + (f"{name}/" if is_dir else f"{name} ({stat.st_size} B)"))
+    return "\n".join(lines)
+
+# ``search`` looks up an on-disk index of the text files under a directory:
+# the lowercase trigrams of each file, to skip the files that cannot match a
+# literal query, and the Python definitions, for symbol queries. The index is
+# brought up to date before every search by re-reading only the files whose
+# mtime or size changed. AutoGen runs the tool calls of one turn in threads:
+# the index of a root is loaded, updated and saved under its own lock.
+_SEARCH_DIR = os.environ.get("TRAJPYRO_CACHE_DIR", os.path.join(".cache", "trajpyro"))
+_SEARCH_MAX_BYTES = 1_000_000
+_SYMBOL = re.compile(r"^\s*(?:async\s+def|def|class)\s+([A-Za-z_]\w*)|^([A-Za-z_]\w*)\s*(?::[^=]*)?=[^=]")
+_search_indexes: Dict[str, Dict[str, dict]] = {}
+_search_locks: Dict[str, threading.Lock] = {}
+_search_locks_lock = threading.Lock()
+
+def _search_lock(root: str) -> threading.Lock:
+    with _search_locks_lock:
+        return _search_locks.setdefault(root, threading.Lock())
+
+def _index_file(full_path: str, stat: os.stat_result) -> dict:
+    entry = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "text": False}
+    if stat.st_size > _SEARCH_MAX_BYTES:
+        return entry
+    data = Path(full_path).read_bytes()
+    if b"\0" in data[:8192]:
+        return entry  # binary
+    text = data.decode("utf-8", "replace")
+    lower = text.lower()
+    entry["text"] = True
+    entry["trigrams"] = {lower[i:i + 3] for i in range(len(lower) - 2)}
+    entry["symbols"] = []
+    if full_path.endswith(".py"):
+        for number, line in enumerate(text.splitlines(), 1):
+            match = _SYMBOL.match(line)
+            if match:
+                entry["symbols"].append([match.group(1) or match.group(2), number])
+    return entry
+
+def _search_index(root: str) -> Dict[str, dict]:
+    """Return the index ``{relative path: entry}`` of *root*, updated from file mtimes.
+
+    The returned dict is a copy, that other searches do not modify.
+    """
+    with _search_lock(root):
+        return dict(_update_search_index(root))
+
+def _update_search_index(root: str) -> Dict[str, dict]:
+    index_path = Path(_SEARCH_DIR, f"search-{hashlib.sha256(root.encode()).hexdigest()[:16]}.json")
+    files = _search_indexes.get(root)
+    if files is None:
+        try:
+            files = json.loads(index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            files = {}
+        for entry in files.values():
+            if entry["text"]:
+                entry["trigrams"] = set(entry["trigrams"])
+
+    changed, seen = False, set()
+    for _, full_path, _, is_dir, stat in _walk(root):
+        if is_dir:
+            continue
+        relative = os.path.relpath(full_path, root)
+        seen.add(relative)
+        entry = files.get(relative)
+        if entry is None or (entry["mtime_ns"], entry["size"]) != (stat.st_mtime_ns, stat.st_size):
+            files[relative] = _index_file(full_path, stat)
+            changed = True
+    for relative in files.keys() - seen:
+        del files[relative]
+        changed = True
+
+    if changed:
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        serializable = {
+            relative: {**entry, "trigrams": sorted(entry["trigrams"])} if entry["text"] else entry
+            for relative, entry in files.items()
+        }
+        _write_atomic(index_path, json.dumps(serializable))
+    _search_indexes[root] = files
+    return files
+
+def search(
+    query: Annotated[str, "Text, regular expression or symbol name to look for"],
+    path: Annotated[str, "Directory to search in"] = ".",
+    regex: Annotated[bool, "Interpret *query* as a Python regular expression"] = False,
+    symbol: Annotated[bool, "Only find where *query* is defined (def, class or assignment in Python files)"] = False,
+    ignore_case: Annotated[bool, "Match regardless of case"] = False,
+    context: Annotated[int, "Number of lines to show around each match"] = 2,
+    max_results: Annotated[int, "Maximum number of matching lines to return"] = 50,
+) -> str:
+    """Search the text files under *path* (minus those ignored by git) and return matching lines with context, grep-style."""
+    root = os.path.abspath(path or ".")
+    files = _search_index(root)
+
+    hits: Dict[str, List[int]] = {}
+    if symbol:
+        for relative, entry in sorted(files.items()):
+            for name, number in entry.get("symbols", []):
+                if name == query or (ignore_case and name.lower() == query.lower()):
+                    hits.setdefault(relative, []).append(number)
+    else:
+        pattern = re.compile(query if regex else re.escape(query), re.IGNORECASE if ignore_case else 0)
+        lower = query.lower()
+        grams = set() if regex else {lower[i:i + 3] for i in range(len(lower) - 2)}
+        for relative, entry in sorted(files.items()):
+            if not entry["text"] or not grams <= entry["trigrams"]:
+                continue
+            with open(os.path.join(root, relative), encoding="utf-8", errors="replace") as f:
+                numbers = [number for number, line in enumerate(f, 1) if pattern.search(line)]
+            if numbers:
+                hits[relative] = numbers
+
+    out, count = [], 0
+    for relative, numbers in hits.items():
+        numbers = numbers[:max_results - count]
+        count += len(numbers)
+        with open(os.path.join(root, relative), encoding="utf-8", errors="replace") as f:
+            lines = f.read().splitlines()
+        # as given to read_file, i.e. relative to the working directory like *path*
+        shown_path = os.path.normpath(os.path.join(path or ".", relative))
+        shown = -1
+        for number in numbers:
+            first = max(number - context, max(shown + 1, 1))
+            if out and first > shown + 1:
+                out.append("--")
+            for n in range(first, min(number + context, len(lines)) + 1):
+                if n > shown:
+                    separator = ":" if n in numbers else "-"
+                    out.append(f"{shown_path}{separator}{n}{separator}{lines[n - 1]}")
+                    shown = n
+        if count == max_results:
+            out.append(f"[... stopped after {max_results} matches; narrow the query or the path ...]")
+            break
+    return "\n".join(out) if out else "No match"
+
+# Agents read logs, lock files or data files into their context: read_file
+# returns at most _READ_MAX_BYTES and never loads more than that window
+# (plus one block) from disk.
+_READ_MAX_BYTES = 32_768
+_READ_BLOCK = 8_192
+
+def _truncated(note: str) -> str:
+    return f"[... {note}; use start_line/end_line, tail or byte_offset to read another part ...]"
+
+def _read_lines(f, start: int, stop: Optional[int], max_bytes: int) -> str:
+    chunks, size = [], 0
+    for number, line in enumerate(itertools.islice(f, start, stop), start):
+        if size + len(line) > max_bytes:
+            chunks.append(line[:max_bytes - size])
+            return b"".join(chunks).decode("utf-8", "replace") + "\n" + _truncated(
+                f"truncated at line {number}, byte limit {max_bytes} reached")
+        chunks.append(line)
+        size += len(line)
+    return b"".join(chunks).decode("utf-8", "replace")
+
+def _read_tail(f, file_size: int, n: int, max_bytes: int) -> str:
+    # read blocks backwards until n full lines or max_bytes are in memory
+    data, position = b"", file_size
+    while position > 0 and data.count(b"\n") <= n and len(data) <= max_bytes:
+        step = min(_READ_BLOCK, position)
+        position -= step
+        f.seek(position)
+        data = f.read(step) + data
+    lines = data.splitlines(keepends=True)
+    if position > 0:
+        lines = lines[1:]  # may start mid-line
+    text = b"".join(lines[-n:] if n > 0 else [])
+    if len(text) > max_bytes or (position > 0 and len(lines) < n):
+        text = text[-max_bytes:]
+        return _truncated(f"truncated, byte limit {max_bytes} reached") + "\n" + text.decode("utf-8", "replace")
+    return text.decode("utf-8", "replace")
+
 def read_file(
-    path: Annotated[str, "File path relative to root"] = None
+    path: Annotated[str, "File path relative to root"] = None,
+    start_line: Annotated[Optional[int], "First line to return, 0-indexed (default: first line)"] = None,
+    end_line: Annotated[Optional[int], "Line at which to stop, excluded (default: last line); end_line=n alone gives the head"] = None,
+    tail: Annotated[Optional[int], "Return only the last *tail* lines"] = None,
+    byte_offset: Annotated[Optional[int], "Return bytes from this offset on, instead of lines"] = None,
+    max_bytes: Annotated[int, "Maximum size of the returned text, in bytes"] = _READ_MAX_BYTES,
 ) -> str:
-    """Read file at *path*."""
-    return Path(path).read_text(encoding="utf-8")
+    """Read file at *path*, or a window of it: a line range, its last lines or a byte range.
+
+    Output longer than *max_bytes* is cut and ends with a truncation marker.
+    """
+    file_size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        if tail is not None:
+            return _read_tail(f, file_size, tail, max_bytes)
+        if byte_offset is not None:
+            f.seek(byte_offset)
+            data = f.read(max_bytes)
+            text = data.decode("utf-8", "replace")
+            if byte_offset + len(data) < file_size:
+                text += "\n" + _truncated(
+                    f"showing bytes {byte_offset}-{byte_offset + len(data)} of {file_size}")
+            return text
+        return _read_lines(f, start_line or 0, end_line, max_bytes)
 
 def create_directory(
     path: Annotated[str, "Directory path relative to root"] = None
@@ -90,70 +442,119 @@ def delete_file(
         raise FileNotFoundError(f"{path} does not exist or is not a file")
     path_obj.unlink()
 
+class LineEdit(TypedDict):
+    op: Literal["insert", "delete", "replace"]
+    line: int
+    text: NotRequired[str]
+
+def _write_atomic(path: Path, text: str) -> None:
+    """Write *text* to *path* through a temporary file and a rename."""
+    # one temporary file per writing thread, so concurrent writers do not collide
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    if path.exists():
+        shutil.copymode(path, tmp)
+    os.replace(tmp, path)  # readers see the old or the new file, never a partial one
+
+def edit_lines(
+    path: Annotated[str, "Path to file"],
+    edits: Annotated[List[LineEdit], "Edits {op, line, text}: 0-indexed lines of the original file; text for insert and replace"],
+) -> None:
+    """Apply several line edits to file *path* in one pass.
+
+    "insert" puts *text* before line *line* (``len(file)`` appends), "delete"
+    removes line *line* and "replace" swaps it for *text*. Line numbers all
+    refer to the file before the batch, so edits do not shift each other.
+    """
+    lines = Path(path).read_text(encoding="utf-8").splitlines()
+    inserts: Dict[int, List[str]] = {}
+    changes: Dict[int, List[str]] = {}
+    for edit in edits:
+        op, line = edit["op"], edit["line"]
+        if op in ("insert", "replace") and "text" not in edit:
+            raise ValueError(f"Edit {edit!r} has no text")
+        if op == "insert":
+            if not (0 <= line <= len(lines)):
+                raise IndexError(f"Line number {line} out of range")
+            inserts.setdefault(line, []).extend(edit["text"].splitlines() or [""])
+        elif op in ("delete", "replace"):
+            if not (0 <= line < len(lines)):
+                raise IndexError(f"Line number {line} out of range")
+            if line in changes:
+                raise ValueError(f"Line {line} is deleted or replaced twice")
+            changes[line] = [] if op == "delete" else edit["text"].splitlines() or [""]
+        else:
+            raise ValueError(f"Unknown edit {op!r}, expected insert, delete or replace")
+
+    out = []
+    for i, old in enumerate(lines):
+        out += inserts.get(i, [])
+        out += changes.get(i, [old])
+    out += inserts.get(len(lines), [])
+    _write_atomic(Path(path), "\n".join(out) + "\n")
+
 def insert_line(
     path: Annotated[str, "Path to file"],
     line_number: Annotated[int, "Line number after which to insert the new line"],
     new_line: Annotated[str, "New line to insert"]
 ) -> None:
     """Insert *new_line* after *line_number* in file *path*."""
-    lines = Path(path).read_text(encoding="utf-8").splitlines()
-    lines.insert(line_number, new_line)
-    Path(path).write_text("\n".join(lines) + "\n", encoding="utf-8")
+    edit_lines(path, [{"op": "insert", "line": line_number, "text": new_line}])
 
 def delete_line(
     path: Annotated[str, "Path to file"],
     line_number: Annotated[int, "Line number to delete"]
 ) -> None:
     """Delete line *line_number* (0-indexed) from file *path*."""
-    lines = Path(path).read_text(encoding="utf-8").splitlines()
-    if not (0 <= line_number < len(lines)):
-        raise IndexError("Line number out of range")
-    del lines[line_number]
-    Path(path).write_text("\n".join(lines) + "\n", encoding="utf-8")
+    edit_lines(path, [{"op": "delete", "line": line_number}])
 
 # ───────────────────────────────────────── Issue helpers ───────────────
 
 def list_issues(
     state: Annotated[str, "State to filter the issues (defaults to 'all')"] = None,
-    label: Annotated[str, "Label to filter the issues (defaults to no filter)"] = None
+    label: Annotated[str, "Label to filter the issues (defaults to no filter)"] = None,
+    limit: Annotated[int, "Maximum number of issues to return, most recent first"] = 50,
+    since: Annotated[Optional[str], "Only issues updated at or after this ISO 8601 date"] = None,
+    with_body: Annotated[bool, "Also return state and body (prefer get_issue_body)"] = False,
 ) -> List[Dict]:
-    """Return issues, optionally filtered by *state* ("open"/"closed") and/or *label* name."""
+    """Return issue summaries (number, title, labels), optionally filtered by *state* ("open"/"closed"), *label* name and update date."""
     state = state or "all"
-    candle = _repo.get_issues(state=state)
-    out = []
-    for iss in candle:
-        if label and label not in [l.name for l in iss.labels]:
-            continue
-        out.append(_issue_dict(iss))
-    return out
+    since_date = datetime.fromisoformat(since) if since else None
+    issues = _backend().list_issues(state, label, since_date, limit)
+    return issues if with_body else [_issue_summary(iss) for iss in issues]
 
 def create_issue(
     title: Annotated[str, "The issue title"],
     body: Annotated[str, "The issue body"]
 ) -> int:
     """Create a new issue on GitHub"""
-    return _repo.create_issue(title=title, body=body).number
+    return _backend().create_issue(title, body)
 
 def comment_issue(
     number: Annotated[int, "issue identification number"],
     comment: Annotated[str, "comment to add to the issue"]
 ) -> None :
     """Add comment to an existing issue on GitHub"""
-    iss = _repo.get_issue(number)
-    iss.create_comment(comment)
+    _backend().comment_issue(number, comment)
 
 def close_issue(
     number: Annotated[int, "issue identification number"]
 ) -> None:
     """Close an existing issue on GitHub"""
-    iss = _repo.get_issue(number)
-    iss.edit(state="closed")
+    _backend().close_issue(number)
 
 def get_issue_body(
     issue_number: Annotated[int, "issue identification number"]
 ) -> str:
     """Return the body text of *issue_number*. Raises if not found."""
-    return _repo.get_issue(issue_number).body or ""
+    return _backend().get_issue(issue_number)["body"]
+
+def get_issues(
+    numbers: Annotated[List[int], "issue identification numbers"],
+    comments: Annotated[int, "number of latest comments to return per issue"] = 3,
+) -> List[Dict]:
+    """Return the issues *numbers* with their body, labels and latest comments, in a single request."""
+    return _backend().get_issues(numbers, comments)
 
 # ───────────────────────────────────────── Labels helpers ───────────────
 
@@ -161,43 +562,32 @@ def list_existing_labels(
     state : Annotated[str, "state of the issues to consider"] = "open"
 ) -> Dict[str, List[int]]:
     """Return mapping {label_name: [issue_numbers,…]} for issues of state **state**."""
-    result: Dict[str, List[int]] = {}
-    for lbl in _repo.get_labels():
-        associated = [iss.number for iss in _repo.get_issues(state=state) if lbl in iss.labels]
-        result[lbl.name] = associated
+    result: Dict[str, List[int]] = {name: [] for name in _backend().list_labels()}
+    # single pass over the issues instead of one listing per label
+    for iss in _backend().list_issues(state):
+        for name in iss["labels"]:
+            result.setdefault(name, []).append(iss["number"])
     return result
 
 def get_labels(
     issue_number: Annotated[int, "issue identification number"]
 ) -> List[str]:
     """List all labels of given issue"""
-    iss = _repo.get_issue(issue_number)
-    return [l.name for l in iss.labels]
+    return _backend().get_issue(issue_number)["labels"]
 
 def add_label(
     issue_number: Annotated[int, "issue identification number"],
     label: Annotated[str, "label to assign to the issue"]
 ) -> List[str]:
     """Add *label* to the given issue (create label if absent). Returns issue's labels."""
-    # ensure label exists
-    try:
-        _repo.get_label(label)
-    except Exception:
-        _repo.create_label(name=label, color="ededed")
-
-    iss = _repo.get_issue(issue_number)
-    iss.add_to_labels(label)
-    return [l.name for l in iss.labels]
+    return _backend().add_label(issue_number, label)
 
 def remove_label(
     issue_number: Annotated[int, "issue identification number"],
     label: Annotated[str, "label to remove from the issue"]
 ) -> List[str]:
     """Remove *label* from issue; returns remaining labels."""
-    iss = _repo.get_issue(issue_number)
-    # safe: GitHub API ignores if label isn't attached
-    iss.remove_from_labels(label)
-    return [l.name for l in iss.labels]
+    return _backend().remove_label(issue_number, label)
 
 # ----------- merge requests ----------------------------------
 
@@ -209,15 +599,46 @@ def open_pull_request(
 ) -> None:
     """Open a pull request on GitHub for *branch*, optionally linking issue *issue_number*."""
     pr_body = f"Closes #{issue_number}\n\n{body}" if issue_number else body
-    _repo.create_pull(title=title, body=pr_body, head=branch, base=_default_branch)
+    _backend().create_pull(title=title, body=pr_body, head=branch)
+
+# ----------- async variants ----------------------------------
+
+# AutoGen awaits the tool calls of one model turn together. The coroutines
+# below run their blocking twin on a dedicated pool, so several GitHub calls
+# proceed in parallel without blocking the event loop, while GH_MAX_WORKERS
+# caps the requests in flight (GitHub rate-limits concurrent bursts).
+_github_pool = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("GH_MAX_WORKERS", 4)),
+    thread_name_prefix="github",
+)
+
+def _run_in_pool(func):
+    """Coroutine version of *func*, with the same name, signature and docstring."""
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_github_pool, functools.partial(func, *args, **kwargs))
+    return wrapper
+
+list_issues_async = _run_in_pool(list_issues)
+create_issue_async = _run_in_pool(create_issue)
+comment_issue_async = _run_in_pool(comment_issue)
+close_issue_async = _run_in_pool(close_issue)
+get_issue_body_async = _run_in_pool(get_issue_body)
+get_issues_async = _run_in_pool(get_issues)
+list_existing_labels_async = _run_in_pool(list_existing_labels)
+get_labels_async = _run_in_pool(get_labels)
+add_label_async = _run_in_pool(add_label)
+remove_label_async = _run_in_pool(remove_label)
+open_pull_request_async = _run_in_pool(open_pull_request)
 
 # ----------- git helpers ----------------------------
 
 def create_and_switch_branch(branch: Annotated[str, "The new branch to create"]) -> None :
     """Create a new """
     repo = Repo()
-    repo.git.checkout(_default_branch)
-    repo.git.pull("origin", _default_branch)
+    repo.git.checkout(_backend().default_branch())
+    repo.git.pull("origin", _backend().default_branch())
     repo.git.checkout("-b", branch)
 
 def diff(
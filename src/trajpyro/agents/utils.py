@@ -1,14 +1,109 @@
 import os
+import time
+import pickle
+import sqlite3
+import functools
+import threading
 from pathlib import Path
+
+import httpx
+import openai
+from autogen_core import CacheStore
+from autogen_core.models import ChatCompletionClient
+from autogen_ext.models.cache import ChatCompletionCache
 from autogen_ext.models.openai import OpenAIChatCompletionClient
 
 _OPENROUTER_API_KEY = os.environ.get("OPENROUTER_API_KEY")
 
-def get_client(what="moonshotai/kimi-k2") -> OpenAIChatCompletionClient:
+# All model clients send their requests through one keep-alive connection
+# pool, so agents reuse the TLS connections to OpenRouter instead of opening
+# their own. Its size is set by LLM_MAX_CONNECTIONS and
+# LLM_MAX_KEEPALIVE_CONNECTIONS.
+_LLM_LIMITS = httpx.Limits(
+    max_connections=int(os.environ.get("LLM_MAX_CONNECTIONS", 20)),
+    max_keepalive_connections=int(os.environ.get("LLM_MAX_KEEPALIVE_CONNECTIONS", 10)),
+    keepalive_expiry=60.0,
+)
+
+@functools.lru_cache(maxsize=None)
+def _http_client() -> httpx.AsyncClient:
+    # openai's defaults (timeouts, redirects) with our pool limits; the pool
+    # binds to the event loop of its first request: one loop per process
+    return openai.DefaultAsyncHttpxClient(limits=_LLM_LIMITS)
+
+# Opt-in response cache: with LLM_CACHE_PATH set, a request identical to a
+# previous one (same model, messages, tools and options) is answered from
+# this SQLite file, so replayed sessions cost no API time. The least
+# recently used responses are evicted beyond LLM_CACHE_MAX_MB.
+_LLM_CACHE_PATH = os.environ.get("LLM_CACHE_PATH")
+_LLM_CACHE_MAX_MB = float(os.environ.get("LLM_CACHE_MAX_MB", 500))
+
+class SqliteCacheStore(CacheStore):
+    """Size-bounded LRU store of model responses in the SQLite file *path*.
+
+    Keys are prefixed with *namespace* (the model name), since the keys of
+    ``ChatCompletionCache`` only hash the request.
+    """
+
+    def __init__(self, path, namespace: str, max_bytes: int):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.namespace = namespace
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses "
+            "(key TEXT PRIMARY KEY, value BLOB, size INTEGER, used REAL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_used ON responses (used)")
+
+    def get(self, key, default=None):
+        key = f"{self.namespace}:{key}"
+        with self._lock, self._db:
+            row = self._db.execute("SELECT value FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return default
+            self._db.execute("UPDATE responses SET used = ? WHERE key = ?", (time.time(), key))
+        return pickle.loads(row[0])
+
+    def set(self, key, value) -> None:
+        key = f"{self.namespace}:{key}"
+        blob = pickle.dumps(value)
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                (key, blob, len(blob), time.time()),
+            )
+            total, = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+            if total <= self.max_bytes:
+                return
+            # evict the least recently used responses until the file fits
+            for old_key, size in self._db.execute(
+                "SELECT key, size FROM responses ORDER BY used"
+            ).fetchall():
+                self._db.execute("DELETE FROM responses WHERE key = ?", (old_key,))
+                total -= size
+                if total <= self.max_bytes:
+                    break
+
+@functools.lru_cache(maxsize=None)
+def get_client(what="moonshotai/kimi-k2") -> ChatCompletionClient:
+    """Return the client of model *what*, one per model and process.
+
+    It is wrapped in the response cache when ``LLM_CACHE_PATH`` is set.
+    """
+    client = _openrouter_client(what)
+    if _LLM_CACHE_PATH:
+        store = SqliteCacheStore(_LLM_CACHE_PATH, what, int(_LLM_CACHE_MAX_MB * 2**20))
+        client = ChatCompletionCache(client, store)
+    return client
+
+def _openrouter_client(what: str) -> OpenAIChatCompletionClient:
     return OpenAIChatCompletionClient(
     model=what,
     base_url="https://openrouter.ai/api/v1",
     api_key=_OPENROUTER_API_KEY,
+    http_client=_http_client(),
     model_info = {
         "context_window":    131_072,
         "max_output_tokens": 16_384,
@@ -25,4 +120,4 @@ def get_client(what="moonshotai/kimi-k2") -> OpenAIChatCompletionClient:
 
 def get_prompt(role : str) -> str:
     path = os.path.join("src", "trajpyro", "agents", "prompts", f"{role}.md")
-    return Path(path).read_text(encoding="utf-8")
\ No newline at end of file
+    return Path(path).read_text(encoding="utf-8")
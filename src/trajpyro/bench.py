@@ -0,0 +1,152 @@
+import argparse
+import json
+from pathlib import Path
+
+import pandas as pd
+import torch
+import pyro
+
+from trajpyro.data.cache import load_state_cache, state_cache_path, write_state_cache
+from trajpyro.evaluator.parameters import transition_error
+from trajpyro.evaluator.profiling import Profiler
+from trajpyro.generator.markov import generate, load_config, transition_probs
+from trajpyro.modeler import markov
+from trajpyro.modeler.inference import run_svi
+
+# ---------------------------------------------------------------------------
+# Measurements ---------------------------------------------------------------
+# ---------------------------------------------------------------------------
+
+def count_rows(states, block: int = 1_000_000) -> torch.Tensor:
+    """Transition counts of a large state matrix, one block of rows at a time."""
+    return sum(markov.transition_counts(states[i:i + block]) for i in range(0, len(states), block))
+
+def fit(states, method: str, num_steps: int, subsample_size: int) -> dict:
+    """Fit the 4-state model on *states*; return the ``run_svi`` record.
+
+    The ``conjugate`` method computes the exact posterior without any step.
+    """
+    if method == "conjugate":
+        markov.conjugate_posterior(count_rows(states))
+        return {"losses": []}
+    if method == "counts":
+        return run_svi(markov.count_model, markov.guide, count_rows(states), num_steps=num_steps)
+    return run_svi(markov.model, markov.guide, states, num_steps=num_steps,
+                   subsample_size=min(subsample_size, len(states)))
+
+def load_states(careers_path, individuals_path, profiler: Profiler) -> torch.Tensor:
+    """Memory-map the state matrix of the data files, pivoting them on a cache miss.
+
+    Hashing the files and looking up the cache run as the ``load`` phase of
+    *profiler*, the pivot as its own ``pivot`` phase.
+    """
+    with profiler.phase("load"):
+        path = state_cache_path(careers_path, individuals_path)
+        states = load_state_cache(path)
+    if states is None:
+        with profiler.phase("pivot"):
+            write_state_cache(careers_path, individuals_path, path)
+        states = load_state_cache(path)
+    return states
+
+# ---------------------------------------------------------------------------
+# Sample size sweep ---------------------------------------------------------
+# ---------------------------------------------------------------------------
+
+def _config_key(config: dict) -> str:
+    """What identifies the data a config generates, whatever its size."""
+    return json.dumps({k: v for k, v in config.items() if k != "num_individuals"},
+                      sort_keys=True, default=str)
+
+def sweep(config: dict, data_dir, sizes, method="counts", num_steps=1000,
+          subsample_size=1024, chunk_size=100_000, num_samples=1000,
+          profiler: Profiler | None = None) -> pd.DataFrame:
+    """Estimate the model on the first *n* individuals of one data set, for each *n*.
+
+    The synthetic data set is generated once with ``max(sizes)`` individuals
+    (unless *data_dir* already holds a large enough one generated from the
+    same *config*, as recorded in its ``config.json``) and its state matrix
+    is memory-mapped, so every size reads the same careers. Each stage runs
+    as a phase of *profiler* (see ``load_states`` for the load and pivot);
+    wall time and peak RSS of the fit are copied into the results table.
+    """
+    profiler = profiler or Profiler("bench", method=method)
+    data_dir = Path(data_dir)
+    individuals_path = data_dir / "individuals.parquet"
+    careers_path = data_dir / "careers.parquet"
+    config_path = data_dir / "config.json"
+
+    states = None
+    try:
+        same_config = _config_key(json.loads(config_path.read_text())) == _config_key(config)
+    except (OSError, ValueError):
+        same_config = False
+    if careers_path.exists() and same_config:
+        states = load_states(careers_path, individuals_path, profiler)
+    if states is None or len(states) < max(sizes):
+        with profiler.phase("generate", n=max(sizes)):
+            generated = {**config, "num_individuals": max(sizes)}
+            config_path.unlink(missing_ok=True)  # no stale record if generation fails
+            generate(generated, data_dir, chunk_size)
+            config_path.write_text(json.dumps(generated, indent=2, default=str))
+        states = load_states(careers_path, individuals_path, profiler)
+    true_probs = transition_probs(config)
+
+    records = []
+    for n in sorted(sizes):
+        pyro.set_rng_seed(config.get("seed", 0))
+        with profiler.phase("fit", n=n):
+            result = fit(states[:n], method, num_steps, subsample_size)
+        with profiler.phase("posterior sampling", n=n):
+            markov.sample_posterior(num_samples)
+
+        fit_phase = profiler.last("fit")
+        records.append({
+            "n": n,
+            "method": method,
+            "wall_time": fit_phase["wall_time"],
+            "cpu_time": fit_phase["cpu_time"],
+            "peak_rss": fit_phase["peak_rss"],
+            "final_elbo": result["losses"][-1] if result["losses"] else float("nan"),
+            **transition_error(markov.posterior_transition_matrix(), true_probs),
+            "elbo": result["losses"],
+        })
+        print(f"n={n:>10,d}  {fit_phase['wall_time']:8.2f} s  "
+              f"{fit_phase['peak_rss'] / 2**20:8.0f} MiB  rmse={records[-1]['rmse']:.4f}")
+
+    return pd.DataFrame.from_records(records)
+
+# ------------------------------------------------------------
+# Entry point
+# ------------------------------------------------------------
+
+def main():
+
+    parser = argparse.ArgumentParser(
+        prog="bench",
+        description="Contrast estimator convergence with compute time as the sample size grows",
+    )
+    parser.add_argument("-c", "--config", required=True, help="Generator config file (YAML)")
+    parser.add_argument("-o", "--out", default="exps/bench", help="Directory for data and results")
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[10 ** k for k in range(3, 8)],
+                        help="Numbers of individuals to estimate on")
+    parser.add_argument("--method", choices=["conjugate", "counts", "svi"], default="counts",
+                        help="Exact posterior, transition-count likelihood or per person-year likelihood")
+    parser.add_argument("--num-steps", type=int, default=1000, help="SVI steps per fit")
+    parser.add_argument("--subsample-size", type=int, default=1024,
+                        help="Individuals per SVI step (svi method)")
+
+    args = parser.parse_args()
+
+    out = Path(args.out)
+    profiler = Profiler("bench", method=args.method, sizes=args.sizes)
+    results = sweep(load_config(args.config), out / "data", args.sizes, args.method,
+                    args.num_steps, args.subsample_size, profiler=profiler)
+    results.to_parquet(out / f"bench-{args.method}.parquet", index=False)
+    profiler.dump(out / f"bench-{args.method}.jsonl")
+    print(results.drop(columns="elbo").to_string(index=False))
+
+if __name__ == "__main__":
+
+    main()
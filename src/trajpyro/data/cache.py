@@ -0,0 +1,83 @@
+import functools
+import hashlib
+import os
+from pathlib import Path
+
+import numpy as np
+import torch
+
+from trajpyro.data.careers import iter_batches, scan_careers
+
+# ---------------------------------------------------------------------------
+# Keys ----------------------------------------------------------------------
+# ---------------------------------------------------------------------------
+
+_CACHE_DIR = os.environ.get("TRAJPYRO_CACHE_DIR", os.path.join(".cache", "trajpyro"))
+
+@functools.lru_cache(maxsize=None)
+def _file_digest(path: str, size: int, mtime_ns: int) -> str:
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+def file_digest(path) -> str:
+    """SHA-256 of the content of *path*.
+
+    Digests are memoized per (path, size, mtime), so a file is hashed only
+    once per process unless it changes.
+    """
+    stat = os.stat(path)
+    return _file_digest(str(Path(path).resolve()), stat.st_size, stat.st_mtime_ns)
+
+# ---------------------------------------------------------------------------
+# State matrix cache --------------------------------------------------------
+# ---------------------------------------------------------------------------
+
+def state_cache_path(careers_path, individuals_path=None, cache_dir=None) -> Path:
+    """Path of the cached state matrix of the data files, named after their hashes."""
+    digests = [file_digest(careers_path)]
+    if individuals_path is not None:
+        digests.append(file_digest(individuals_path))
+    key = hashlib.sha256("-".join(digests).encode()).hexdigest()[:32]
+    return Path(cache_dir or _CACHE_DIR, f"states-{key}.npy")
+
+def write_state_cache(careers_path, individuals_path, path, batch_size: int = 100_000) -> None:
+    """Pivot a Parquet career file batch by batch into the ``.npy`` file *path*."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    ids, years = scan_careers(careers_path)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    out = np.lib.format.open_memmap(tmp, mode="w+", dtype=np.int8, shape=(len(ids), len(years)))
+    start = 0
+    for states in iter_batches(careers_path, batch_size, individuals_path,
+                               ids=ids, years=years, shuffle=False):
+        out[start:start + len(states)] = states.numpy()
+        start += len(states)
+    out.flush()
+    del out
+    os.replace(tmp, path)  # atomic: readers never see a partial file
+
+def load_state_cache(path) -> torch.Tensor | None:
+    """Memory-map the cached state matrix *path*, or return ``None`` if there is none."""
+    if not Path(path).exists():
+        return None
+    return torch.from_numpy(np.load(path, mmap_mode="c"))
+
+def cached_state_matrix(
+    careers_path,
+    individuals_path=None,
+    cache_dir=None,
+    batch_size: int = 100_000,
+) -> torch.Tensor:
+    """Return the ``(N, T)`` int8 state matrix of a Parquet career file.
+
+    The first call pivots the file batch by batch into a ``.npy`` file named
+    after the data file hashes; later calls memory-map it and return a
+    zero-copy tensor view, so nothing is parsed again. The view is
+    copy-on-write: in-place changes never reach the cache file.
+    """
+    path = state_cache_path(careers_path, individuals_path, cache_dir)
+    states = load_state_cache(path)
+    if states is None:
+        write_state_cache(careers_path, individuals_path, path, batch_size)
+        states = load_state_cache(path)
+    return states
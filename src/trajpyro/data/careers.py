@@ -0,0 +1,238 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import torch
+
+from trajpyro.data.spells import is_spells, spell_years
+
+# ---------------------------------------------------------------------------
+# State codes ---------------------------------------------------------------
+# ---------------------------------------------------------------------------
+
+# Order matters: the position of a state is its integer code everywhere
+# (generator, modeller, evaluator). Death never appears in the career table,
+# it is deduced from the death date of the individuals table.
+STATES = ("inactivity", "employment", "retirement", "death")
+INACTIVITY, EMPLOYMENT, RETIREMENT, DEATH = range(len(STATES))
+MISSING = -1
+
+# The state column is stored dictionary-encoded: int8 codes plus the names
+# above, read back by pandas as a Categorical.
+STATE_TYPE = pa.dictionary(pa.int8(), pa.string())
+
+# ---------------------------------------------------------------------------
+# Pivot ---------------------------------------------------------------------
+# ---------------------------------------------------------------------------
+
+def state_array(codes: np.ndarray) -> pa.DictionaryArray:
+    """Dictionary-encoded Arrow array of states from their integer codes."""
+    return pa.DictionaryArray.from_arrays(pa.array(codes, type=pa.int8()), pa.array(STATES))
+
+def state_codes(states: pd.Series) -> np.ndarray:
+    """Integer codes of a column of states (``MISSING`` if unknown).
+
+    A Categorical column, as read from a dictionary-encoded Parquet column,
+    is recoded through its categories only: no per-row string comparison.
+    """
+    states = pd.Categorical(states)
+    recode = np.array([STATES.index(c) if c in STATES else MISSING for c in states.categories]
+                      + [MISSING], dtype=np.int8)
+    # Categorical codes are -1 for missing values, which picks the last entry
+    return recode[states.codes]
+
+def state_matrix(
+    careers: pd.DataFrame,
+    individuals: pd.DataFrame | None = None,
+    ids: np.ndarray | None = None,
+    years: range | None = None,
+) -> torch.Tensor:
+    """Pivot a career (or spell) table into an ``(N, T)`` int8 tensor of state codes.
+
+    Rows follow *ids* (sorted ids of *careers* by default), columns follow
+    *years* (the observed year span by default). Cells without a career row
+    are ``MISSING``, except the year of death, taken from *individuals*,
+    which is coded ``DEATH``.
+    """
+    if ids is None:
+        ids = np.unique(careers["id"].to_numpy())
+
+    if is_spells(careers.columns):
+        spell_rows, career_years = spell_years(careers)
+        career_ids = careers["id"].to_numpy()[spell_rows]
+        codes = state_codes(careers["state"])[spell_rows]
+    else:
+        career_years = careers["year"].to_numpy()
+        career_ids = careers["id"].to_numpy()
+        codes = state_codes(careers["state"])
+
+    dead_ids, death_years = np.array([], dtype=np.int64), np.array([], dtype=np.int64)
+    if individuals is not None:
+        dead = individuals[individuals["death"].notna() & individuals["id"].isin(ids)]
+        dead_ids = dead["id"].to_numpy()
+        death_years = pd.to_datetime(dead["death"]).dt.year.to_numpy()
+    if years is None:
+        all_years = np.concatenate([career_years, death_years])
+        years = range(int(all_years.min()), int(all_years.max()) + 1)
+
+    out = np.full((len(ids), len(years)), MISSING, dtype=np.int8)
+    out[np.searchsorted(ids, career_ids), career_years - years.start] = codes
+
+    in_span = (death_years >= years.start) & (death_years < years.stop)
+    out[np.searchsorted(ids, dead_ids[in_span]), death_years[in_span] - years.start] = DEATH
+
+    return torch.from_numpy(out)
+
+# ---------------------------------------------------------------------------
+# Parquet loader ------------------------------------------------------------
+# ---------------------------------------------------------------------------
+
+def scan_careers(path) -> tuple[np.ndarray, range]:
+    """Return the sorted distinct ids and the year span of a career file.
+
+    Only the ``id`` and year columns are read, one record batch at a time.
+    Spell files are accepted as well.
+    """
+    parquet = pq.ParquetFile(path)
+    spells = is_spells(parquet.schema_arrow.names)
+    first_column, last_column = ("start_year", "end_year") if spells else ("year", "year")
+
+    ids, first, last = [], None, None
+    columns = list(dict.fromkeys(["id", first_column, last_column]))
+    for batch in parquet.iter_batches(columns=columns):
+        ids.append(np.unique(batch.column("id").to_numpy()))
+        batch_first = batch.column(first_column).to_numpy().min()
+        batch_last = batch.column(last_column).to_numpy().max()
+        first = batch_first if first is None else min(first, batch_first)
+        last = batch_last if last is None else max(last, batch_last)
+    return np.unique(np.concatenate(ids)), range(int(first), int(last) + 1)
+
+def _id_units(parquet: pq.ParquetFile) -> list[tuple[list[int], int]] | None:
+    """Group the row groups of a file sorted by id into ``(row groups, first id)`` units.
+
+    Units share no id: row groups that split an id are merged. Returns
+    ``None`` if the ``id`` statistics are missing or the file is not sorted.
+    """
+    metadata, column = parquet.metadata, parquet.schema_arrow.get_field_index("id")
+    units, last = [], None
+    for i in range(metadata.num_row_groups):
+        statistics = metadata.row_group(i).column(column).statistics
+        if statistics is None or not statistics.has_min_max or (last is not None and statistics.min < last):
+            return None
+        if statistics.min == last:
+            units[-1][0].append(i)
+        else:
+            units.append(([i], statistics.min))
+        last = statistics.max
+    return units
+
+def _rows_of(frame: pd.DataFrame, ids: np.ndarray) -> pd.DataFrame:
+    """Rows of the sorted *ids* in *frame*, sorted by id."""
+    frame_ids = frame["id"].to_numpy()
+    starts = np.searchsorted(frame_ids, ids, side="left")
+    lengths = np.searchsorted(frame_ids, ids, side="right") - starts
+    positions = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+    return frame.iloc[positions].reset_index(drop=True)
+
+def iter_tables(
+    careers_path,
+    batch_size: int,
+    individuals_path=None,
+    ids: np.ndarray | None = None,
+    shuffle: bool = True,
+    seed: int | None = None,
+):
+    """Yield ``(careers, individuals, ids)`` data frames for batches of ids.
+
+    A file sorted by id, as written by the generator and ``convert_careers``,
+    is read one row group at a time (in random order if *shuffle*), so a
+    pass over the file reads it once: random batches draw their ids from the
+    current row group and the remainder of the previous one, not from the
+    whole file. Other files are read with an ``id`` filter per batch.
+    *individuals* is ``None`` unless *individuals_path* is given.
+    """
+    if ids is None:
+        ids, _ = scan_careers(careers_path)
+    rng = np.random.default_rng(seed)
+
+    parquet = pq.ParquetFile(careers_path)
+    units = _id_units(parquet)
+    if units is None:
+        yield from _iter_filtered_tables(careers_path, batch_size, individuals_path, ids, shuffle, rng)
+        return
+
+    # every id goes to the last unit starting at or before it
+    ids = np.sort(ids)
+    unit_of = np.maximum(np.searchsorted([first for _, first in units], ids, side="right") - 1, 0)
+    bounds = np.searchsorted(unit_of, np.arange(len(units) + 1))
+
+    def take(frames, batch_ids):
+        if len(frames) == 1:
+            return _rows_of(frames[0], batch_ids)
+        return pd.concat([_rows_of(frame, batch_ids) for frame in frames], ignore_index=True) \
+            .sort_values("id", kind="stable", ignore_index=True)
+
+    left_ids, left_careers, left_individuals = ids[:0], [], []
+    for k in (rng.permutation(len(units)) if shuffle else range(len(units))):
+        unit_ids = ids[bounds[k]:bounds[k + 1]]
+        if not len(unit_ids):
+            continue
+        careers = left_careers + [parquet.read_row_groups(units[k][0]).to_pandas()]
+        individuals = left_individuals
+        if individuals_path is not None:
+            id_range = [("id", ">=", int(unit_ids[0])), ("id", "<=", int(unit_ids[-1]))]
+            individuals = individuals + [pq.read_table(individuals_path, filters=id_range).to_pandas()]
+        # sorted ids stay sorted: the remainder precedes the unit in the file
+        pool = np.concatenate([left_ids, unit_ids])
+        if shuffle:
+            pool = rng.permutation(pool)
+
+        full = len(pool) - len(pool) % batch_size
+        for start in range(0, full, batch_size):
+            batch_ids = np.sort(pool[start:start + batch_size])
+            yield (take(careers, batch_ids),
+                   take(individuals, batch_ids) if individuals_path is not None else None,
+                   batch_ids)
+        left_ids = np.sort(pool[full:])
+        left_careers = [take(careers, left_ids)]
+        left_individuals = [take(individuals, left_ids)] if individuals_path is not None else []
+
+    if len(left_ids):
+        yield (take(left_careers, left_ids),
+               take(left_individuals, left_ids) if individuals_path is not None else None,
+               left_ids)
+
+def _iter_filtered_tables(careers_path, batch_size, individuals_path, ids, shuffle, rng):
+    order = rng.permutation(len(ids)) if shuffle else np.arange(len(ids))
+    for start in range(0, len(ids), batch_size):
+        batch_ids = np.sort(ids[order[start:start + batch_size]])
+        id_filter = [("id", "in", batch_ids.tolist())]
+        careers = pq.read_table(careers_path, filters=id_filter).to_pandas()
+        individuals = None
+        if individuals_path is not None:
+            individuals = pq.read_table(individuals_path, filters=id_filter).to_pandas()
+        yield careers, individuals, batch_ids
+
+def iter_batches(
+    careers_path,
+    batch_size: int,
+    individuals_path=None,
+    ids: np.ndarray | None = None,
+    years: range | None = None,
+    shuffle: bool = True,
+    seed: int | None = None,
+):
+    """Yield ``(batch_size, T)`` state tensors for random batches of ids.
+
+    See ``iter_tables`` for the reading strategy. All batches share the same
+    year columns. Deaths are taken from *individuals_path* when given.
+    """
+    if ids is None or years is None:
+        scanned_ids, scanned_years = scan_careers(careers_path)
+        ids = scanned_ids if ids is None else ids
+        years = scanned_years if years is None else years
+
+    for careers, individuals, batch_ids in iter_tables(
+        careers_path, batch_size, individuals_path, ids, shuffle, seed
+    ):
+        yield state_matrix(careers, individuals, ids=batch_ids, years=years)
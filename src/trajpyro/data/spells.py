@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# ---------------------------------------------------------------------------
+# Spell table ---------------------------------------------------------------
+# ---------------------------------------------------------------------------
+
+# Run-length encoding of the career table: one row per maximal run of
+# consecutive years spent in the same state, bounds included.
+#
+#   | id  |      state | start_year | end_year |
+#   |-----|------------|------------|----------|
+#   |   1 | inactivity |       1960 |     1980 |
+#   |   1 | employment |       1981 |     2002 |
+#   |   1 | retirement |       2003 |     2010 |
+
+SPELL_COLUMNS = ["id", "state", "start_year", "end_year"]
+
+def is_spells(columns) -> bool:
+    """Whether a table with *columns* is a spell table rather than a career table."""
+    return "start_year" in columns
+
+def to_spells(careers: pd.DataFrame) -> pd.DataFrame:
+    """Encode a yearly career table as spells."""
+    careers = careers.sort_values(["id", "year"], kind="stable")
+    ids = careers["id"].to_numpy()
+    years = careers["year"].to_numpy()
+    state = careers["state"]
+    # compare Categorical codes rather than the state names
+    states = state.cat.codes.to_numpy() if isinstance(state.dtype, pd.CategoricalDtype) else state.to_numpy()
+
+    new = np.ones(len(careers), dtype=bool)
+    new[1:] = (ids[1:] != ids[:-1]) | (states[1:] != states[:-1]) | (years[1:] != years[:-1] + 1)
+    starts = np.flatnonzero(new)
+    ends = np.append(starts[1:], len(careers)) - 1
+
+    return pd.DataFrame({
+        "id": ids[starts],
+        "state": state.iloc[starts].reset_index(drop=True),
+        "start_year": years[starts],
+        "end_year": years[ends],
+    })
+
+def spell_years(spells: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+    """Return, for every year covered by *spells*, its spell row and the year."""
+    lengths = (spells["end_year"] - spells["start_year"] + 1).to_numpy()
+    rows = np.repeat(np.arange(len(spells)), lengths)
+    # offset of each year within its spell
+    offsets = np.arange(len(rows)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    start = spells["start_year"].to_numpy()
+    return rows, (start[rows] + offsets).astype(start.dtype)
+
+def from_spells(spells: pd.DataFrame) -> pd.DataFrame:
+    """Decode spells back into the yearly career table."""
+    rows, years = spell_years(spells)
+    return pd.DataFrame({
+        "id": spells["id"].to_numpy()[rows],
+        "year": years,
+        "state": spells["state"].iloc[rows].reset_index(drop=True),
+    })
+
+def convert_careers(careers_path, spells_path, batch_size: int = 1_000_000) -> None:
+    """Encode a Parquet career table as a Parquet spell table, batch by batch.
+
+    Rows of the last id of a batch are carried over to the next one, so a
+    career split across batches still yields maximal spells.
+    """
+    carry, writer = None, None
+
+    def write(careers):
+        nonlocal writer
+        if careers.empty:
+            return
+        spells = pa.Table.from_pandas(to_spells(careers), preserve_index=False)
+        writer = writer or pq.ParquetWriter(spells_path, spells.schema)
+        writer.write_table(spells)
+
+    try:
+        for batch in pq.ParquetFile(careers_path).iter_batches(batch_size=batch_size):
+            careers = batch.to_pandas()
+            if carry is not None:
+                careers = pd.concat([carry, careers], ignore_index=True)
+            last = careers["id"].iat[-1]
+            carry = careers[careers["id"] == last]
+            write(careers[careers["id"] != last])
+        if carry is not None:
+            write(carry)
+    finally:
+        if writer is not None:
+            writer.close()
@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+
+from trajpyro.data.careers import STATES, DEATH, state_codes
+from trajpyro.data.spells import is_spells
+
+# ---------------------------------------------------------------------------
+# Aggregated criteria -------------------------------------------------------
+# ---------------------------------------------------------------------------
+
+def state_counts_per_year(careers: pd.DataFrame) -> pd.DataFrame:
+    """Number of people in each state per year, from a career or spell table.
+
+    Returns a frame indexed by year with one column per observed state, e.g.
+    ``["employment"]`` is the number of employed people per year and
+    ``["retirement"]`` the number of pensioners per year. Spells are counted
+    by cumulating +1 at their first year and -1 after their last one.
+    """
+    observed = list(STATES[:DEATH])
+    codes = state_codes(careers["state"])
+
+    if not is_spells(careers.columns):
+        years = careers["year"].to_numpy()
+        first = int(years.min())
+        counts = np.zeros((int(years.max()) - first + 1, len(observed)), dtype=np.int64)
+        np.add.at(counts, (years - first, codes), 1)
+    else:
+        start, end = careers["start_year"].to_numpy(), careers["end_year"].to_numpy()
+        first = int(start.min())
+        counts = np.zeros((int(end.max()) - first + 2, len(observed)), dtype=np.int64)
+        np.add.at(counts, (start - first, codes), 1)
+        np.add.at(counts, (end - first + 1, codes), -1)
+        counts = counts.cumsum(axis=0)[:-1]
+
+    index = pd.RangeIndex(first, first + len(counts), name="year")
+    return pd.DataFrame(counts, index=index, columns=observed)
+
+def aggregate_difference(estimated: pd.DataFrame, observed: pd.DataFrame) -> pd.DataFrame:
+    """Simple difference between two aggregated tables, aligned on year."""
+    return estimated.sub(observed, fill_value=0)
@@ -0,0 +1,17 @@
+import torch
+
+# ---------------------------------------------------------------------------
+# Parametric criteria -------------------------------------------------------
+# ---------------------------------------------------------------------------
+
+def transition_error(estimated, true) -> dict:
+    """Compare an estimated transition matrix with the generator's one.
+
+    Returns the largest absolute difference and the root mean squared error
+    over all entries.
+    """
+    diff = torch.as_tensor(estimated, dtype=torch.float64) - torch.as_tensor(true, dtype=torch.float64)
+    return {
+        "max_abs_error": diff.abs().max().item(),
+        "rmse": diff.pow(2).mean().sqrt().item(),
+    }
@@ -0,0 +1,107 @@
+import contextlib
+import datetime
+import json
+import resource
+import sys
+import time
+
+import torch
+
+# ---------------------------------------------------------------------------
+# Memory probes -------------------------------------------------------------
+# ---------------------------------------------------------------------------
+
+def _reset_peak_rss() -> bool:
+    """Reset the kernel's peak RSS counter of this process (Linux only)."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+def peak_rss() -> int:
+    """Peak resident set size in bytes, since the last reset if any."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+def _torch_memory() -> dict:
+    """Allocator statistics of the accelerator in use, empty on CPU."""
+    if torch.cuda.is_available():
+        return {
+            "torch_allocated": torch.cuda.memory_allocated(),
+            "torch_peak_allocated": torch.cuda.max_memory_allocated(),
+            "torch_reserved": torch.cuda.memory_reserved(),
+        }
+    if torch.backends.mps.is_available():
+        return {
+            "torch_allocated": torch.mps.current_allocated_memory(),
+            "torch_reserved": torch.mps.driver_allocated_memory(),
+        }
+    return {}
+
+# ---------------------------------------------------------------------------
+# Profiler ------------------------------------------------------------------
+# ---------------------------------------------------------------------------
+
+class Profiler:
+    """Record wall time, CPU time and memory of the named phases of one run.
+
+    Use ``phase`` as a context manager or as a decorator::
+
+        profiler = Profiler("bench")
+        with profiler.phase("load"):
+            states = cached_state_matrix(path)
+
+        @profiler.phase("fit")
+        def fit(): ...
+
+    Peak RSS is measured per phase on Linux, where the kernel counter can be
+    reset; elsewhere it is the peak of the whole process so far, as flagged
+    by ``peak_rss_scope``. Phases are therefore not meant to be nested.
+    """
+
+    def __init__(self, run: str, **metadata):
+        self.run = run
+        self.metadata = metadata
+        self.started = datetime.datetime.now().isoformat(timespec="seconds")
+        self.phases: list[dict] = []
+
+    @contextlib.contextmanager
+    def phase(self, name: str, **metadata):
+        scope = "phase" if _reset_peak_rss() else "process"
+        if torch.cuda.is_available():
+            torch.cuda.reset_peak_memory_stats()
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            self.phases.append({
+                "phase": name,
+                **metadata,
+                "wall_time": time.perf_counter() - wall,
+                "cpu_time": time.process_time() - cpu,
+                "peak_rss": peak_rss(),
+                "peak_rss_scope": scope,
+                **_torch_memory(),
+            })
+
+    def last(self, name: str) -> dict:
+        """Most recent record of phase *name*."""
+        return next(p for p in reversed(self.phases) if p["phase"] == name)
+
+    def record(self) -> dict:
+        """JSON-serializable record of the run."""
+        return {"run": self.run, "started": self.started, **self.metadata, "phases": self.phases}
+
+    def dump(self, path) -> None:
+        """Append the run record to the JSON-lines file *path*."""
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(self.record()) + "\n")
@@ -0,0 +1,157 @@
+import argparse
+import datetime
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+import yaml
+
+from trajpyro.data.careers import STATES, STATE_TYPE, INACTIVITY, DEATH, MISSING, state_array
+
+# ---------------------------------------------------------------------------
+# Configuration -------------------------------------------------------------
+# ---------------------------------------------------------------------------
+
+# Expected keys of the (hidden) config file:
+#
+#   seed: 0
+#   num_individuals: 10000
+#   birth_years: [1940, 2000]   # births are uniform over this span
+#   end_year: 2020              # last simulated year
+#   transitions:                # one row per transient state, sums to 1
+#     inactivity: {inactivity: 0.80, employment: 0.15, retirement: 0.0, death: 0.05}
+#     employment: {inactivity: 0.10, employment: 0.80, retirement: 0.08, death: 0.02}
+#     retirement: {retirement: 0.90, death: 0.10}
+
+def load_config(path) -> dict:
+    """Read a generator config file."""
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f)
+
+def transition_probs(config: dict) -> np.ndarray:
+    """Return the ``(4, 4)`` transition matrix described by *config*."""
+    probs = np.zeros((len(STATES), len(STATES)))
+    probs[DEATH, DEATH] = 1.0
+    for origin, row in config["transitions"].items():
+        for destination, p in row.items():
+            probs[STATES.index(origin), STATES.index(destination)] = p
+    if not np.allclose(probs.sum(axis=1), 1.0):
+        raise ValueError("Each row of transitions must sum to 1")
+    return probs
+
+# ---------------------------------------------------------------------------
+# Simulation ----------------------------------------------------------------
+# ---------------------------------------------------------------------------
+
+CAREERS_SCHEMA = pa.schema([("id", pa.int64()), ("year", pa.int32()), ("state", STATE_TYPE)])
+INDIVIDUALS_SCHEMA = pa.schema([("id", pa.int64()), ("birth", pa.date32()), ("death", pa.date32())])
+
+def _random_dates(rng, years: np.ndarray) -> np.ndarray:
+    """A uniformly drawn day within each of *years*."""
+    start = (years - 1970).astype("datetime64[Y]").astype("datetime64[D]")
+    return start + rng.integers(0, 365, size=len(years)).astype("timedelta64[D]")
+
+def simulate_chunk(rng, birth_years: np.ndarray, end_year: int, probs: np.ndarray):
+    """Simulate the yearly chain of one chunk of individuals.
+
+    Everybody starts inactive in their birth year. Returns the ``(n, T)``
+    state codes over ``range(birth_years.min(), end_year + 1)``, coded
+    ``DEATH`` in the year of death and ``MISSING`` outside of life, and the
+    death years (``-1`` if still alive at *end_year*).
+    """
+    first_year = int(birth_years.min())
+    cumprobs = np.cumsum(probs, axis=1)
+    cumprobs[:, -1] = 1.0  # guard against rounding
+    states = np.full((len(birth_years), end_year - first_year + 1), MISSING, dtype=np.int8)
+    death_years = np.full(len(birth_years), -1)
+
+    current = np.full(len(birth_years), MISSING, dtype=np.int8)
+    for t, year in enumerate(range(first_year, end_year + 1)):
+        current[current == DEATH] = MISSING  # died the previous year
+        alive = current >= 0
+        u = rng.random(int(alive.sum()))
+        current[alive] = (u[:, None] > cumprobs[current[alive]]).sum(axis=1)
+        current[birth_years == year] = INACTIVITY
+        states[:, t] = current
+        death_years[current == DEATH] = year
+
+    return states, death_years
+
+def simulate(config: dict, chunk_size: int = 100_000):
+    """Yield ``(individuals, careers)`` Arrow tables, one chunk of ids at a time.
+
+    Only *chunk_size* careers are held in memory at once, whatever the total
+    number of individuals.
+    """
+    probs = transition_probs(config)
+    first_birth, last_birth = config["birth_years"]
+    end_year = config["end_year"]
+
+    for chunk, start in enumerate(range(0, config["num_individuals"], chunk_size)):
+        rng = np.random.default_rng([config.get("seed", 0), chunk])
+        ids = np.arange(start, min(start + chunk_size, config["num_individuals"]))
+        birth_years = rng.integers(first_birth, last_birth + 1, size=len(ids))
+        states, death_years = simulate_chunk(rng, birth_years, end_year, probs)
+
+        dead = death_years >= 0
+        deaths = np.full(len(ids), np.datetime64("NaT", "D"), dtype="datetime64[D]")
+        deaths[dead] = _random_dates(rng, death_years[dead])
+        individuals = pa.table({
+            "id": ids,
+            "birth": _random_dates(rng, birth_years),
+            "death": pa.array(deaths, mask=~dead),
+        }, schema=INDIVIDUALS_SCHEMA)
+
+        # row-major flattening keeps the career rows sorted by id then year
+        rows, cols = np.nonzero((states >= 0) & (states != DEATH))
+        careers = pa.table({
+            "id": ids[rows],
+            "year": (int(birth_years.min()) + cols).astype(np.int32),
+            "state": state_array(states[rows, cols]),
+        }, schema=CAREERS_SCHEMA)
+
+        yield individuals, careers
+
+def generate(config: dict, out_dir, chunk_size: int = 100_000) -> tuple[Path, Path]:
+    """Write ``individuals.parquet`` and ``careers.parquet`` into *out_dir*.
+
+    Each chunk is appended as its own row group.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    individuals_path = out_dir / "individuals.parquet"
+    careers_path = out_dir / "careers.parquet"
+
+    with pq.ParquetWriter(individuals_path, INDIVIDUALS_SCHEMA) as individuals_writer, \
+         pq.ParquetWriter(careers_path, CAREERS_SCHEMA) as careers_writer:
+        for individuals, careers in simulate(config, chunk_size):
+            individuals_writer.write_table(individuals)
+            careers_writer.write_table(careers, row_group_size=max(careers.num_rows, 1))
+
+    return individuals_path, careers_path
+
+# ------------------------------------------------------------
+# Entry point
+# ------------------------------------------------------------
+
+def main():
+
+    parser = argparse.ArgumentParser(
+        prog="generate",
+        description="Simulate synthetic careers from the 4-state Markov model",
+    )
+    parser.add_argument("-c", "--config", required=True, help="Generator config file (YAML)")
+    parser.add_argument("-o", "--out", required=True, help="Output directory")
+    parser.add_argument("--chunk-size", type=int, default=100_000,
+                        help="Number of individuals simulated and written at once")
+
+    args = parser.parse_args()
+
+    start = datetime.datetime.now()
+    paths = generate(load_config(args.config), args.out, args.chunk_size)
+    print(f"Wrote {', '.join(map(str, paths))} in {datetime.datetime.now() - start}")
+
+if __name__ == "__main__":
+
+    main()
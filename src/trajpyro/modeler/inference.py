@@ -0,0 +1,85 @@
+import itertools
+import time
+import warnings
+
+import torch
+import pyro
+from pyro.infer import SVI, JitTrace_ELBO, Trace_ELBO
+from pyro.optim import Adam
+
+# ---------------------------------------------------------------------------
+# Replicas ------------------------------------------------------------------
+# ---------------------------------------------------------------------------
+
+def chain_plate(num_chains: int, dim: int = -2) -> pyro.plate:
+    """Outer plate over *num_chains* independent replicas of a model.
+
+    Every site sampled inside the plate gets one copy per chain, so a single
+    SVI step advances all replicas with the same tensor ops. Since the ELBO is
+    a sum over chains and Adam works element-wise, replicas do not interact.
+    Inner plates must use dimensions to the right of *dim*.
+    """
+    return pyro.plate("chains", num_chains, dim=dim)
+
+# ---------------------------------------------------------------------------
+# SVI loop ------------------------------------------------------------------
+# ---------------------------------------------------------------------------
+
+def _shapes(args) -> list:
+    """Shapes of the tensor arguments, used to detect dynamic shapes."""
+    return [tuple(a.shape) if torch.is_tensor(a) else None for a in args]
+
+def run_svi(model, guide, *args, num_steps=1000, **kwargs) -> dict:
+    """Fit *guide* to *model* with SVI on a fresh param store.
+
+    Positional arguments are the data of every step; see ``run_svi_batches``
+    for the other options and the returned record.
+    """
+    return run_svi_batches(model, guide, itertools.repeat(args, num_steps), **kwargs)
+
+def run_svi_batches(model, guide, batches, lr=0.05, log_every=None, jit=False, **kwargs) -> dict:
+    """Fit *guide* to *model* with SVI, one step per item of *batches*.
+
+    Each item is a tensor or a tuple of positional arguments; keyword
+    arguments are forwarded to both model and guide at every step. This is
+    the entry point for mini-batches streamed from disk.
+
+    With *jit*, the ELBO is compiled once with ``JitTrace_ELBO`` instead of
+    re-traced at every step; the loop falls back to ``Trace_ELBO`` if
+    compilation fails or if the batch shapes change (e.g. a short last batch).
+
+    Returns ``{"losses": [...], "step_times": [...], "mode": "jit" | "eager"}``
+    with one ELBO loss and one wall time (seconds) per step.
+    """
+    pyro.clear_param_store()
+    optim = Adam({"lr": lr})
+    elbo = JitTrace_ELBO(ignore_jit_warnings=True) if jit else Trace_ELBO()
+    svi = SVI(model, guide, optim, elbo)
+    mode = "jit" if jit else "eager"
+    shapes = None
+
+    losses, step_times = [], []
+    for step, args in enumerate(batches):
+        args = args if isinstance(args, tuple) else (args,)
+        shapes = shapes or _shapes(args)
+        if mode == "jit" and _shapes(args) != shapes:
+            warnings.warn("Batch shapes changed between steps, falling back to Trace_ELBO")
+            svi, mode = SVI(model, guide, optim, Trace_ELBO()), "eager"
+
+        start = time.perf_counter()
+        try:
+            loss = svi.step(*args, **kwargs)
+        except Exception as exc:
+            if mode != "jit":
+                raise
+            warnings.warn(f"JitTrace_ELBO failed ({exc}), falling back to Trace_ELBO")
+            svi, mode = SVI(model, guide, optim, Trace_ELBO()), "eager"
+            start = time.perf_counter()
+            loss = svi.step(*args, **kwargs)
+        step_times.append(time.perf_counter() - start)
+
+        losses.append(loss)
+        if log_every and step % log_every == 0:
+            print(f"SVI step {step:02d}, ELBO = {loss:.2f}")
+
+    return {"losses": losses, "step_times": step_times, "mode": mode}
@@ -1,40 +1,44 @@
 # main.py
-import sys, platform, math
+import sys, platform
 import torch, pyro
 import pyro.distributions as dist
-from pyro.infer import SVI, Trace_ELBO
-from pyro.optim import Adam
 
+from trajpyro.modeler.inference import chain_plate, run_svi
 
-def beta_bernoulli_demo(num_obs=50, true_p=0.7):
-    """Return approximate alpha, beta for a coin with unknown bias."""
-    observations = torch.bernoulli(torch.full((num_obs,), true_p))
 
-    # Model: p ~ Beta(1,1); data ~ Bernoulli(p)
+def beta_bernoulli_demo(num_obs=50, true_p=0.7, num_chains=1, num_steps=20, log_every=5, jit=False):
+    """Return approximate alpha, beta for coins with unknown bias.
+
+    *true_p* is either a scalar or one bias per chain; the *num_chains*
+    replicas are fitted jointly in one batched model and the results are
+    tensors of shape ``(num_chains,)``, followed by the ``run_svi`` record.
+    """
+    true_p = torch.as_tensor(true_p, dtype=torch.float).expand(num_chains)
+    observations = torch.bernoulli(true_p.unsqueeze(-1).expand(num_chains, num_obs))
+
+    # Model: p ~ Beta(1,1); data ~ Bernoulli(p), once per chain
     def model(data):
-        p = pyro.sample("p", dist.Beta(1.0, 1.0))
-        with pyro.plate("data", data.size(0)):
-            pyro.sample("obs", dist.Bernoulli(p), obs=data)
+        with chain_plate(data.size(0)):
+            p = pyro.sample("p", dist.Beta(1.0, 1.0))
+            with pyro.plate("data", data.size(1), dim=-1):
+                pyro.sample("obs", dist.Bernoulli(p), obs=data)
 
-    # Guide: q(p) ~ Beta(alpha, beta)
+    # Guide: q(p) ~ Beta(alpha, beta), once per chain
     def guide(data):
-        alpha = pyro.param("alpha", torch.tensor(1.0),
+        alpha = pyro.param("alpha", torch.ones(data.size(0), 1),
                            constraint=dist.constraints.positive)
-        beta = pyro.param("beta", torch.tensor(1.0),
+        beta = pyro.param("beta", torch.ones(data.size(0), 1),
                           constraint=dist.constraints.positive)
-        pyro.sample("p", dist.Beta(alpha, beta))
+        with chain_plate(data.size(0)):
+            pyro.sample("p", dist.Beta(alpha, beta))
 
-    svi = SVI(model, guide, Adam({"lr": 0.05}), Trace_ELBO())
+    fit = run_svi(model, guide, observations, num_steps=num_steps,
+                  log_every=log_every, jit=jit)
 
-    for step in range(20):
-        loss = svi.step(observations)
-        if step % 5 == 0:
-            print(f"SVI step {step:02d}, ELBO = {loss:.2f}")
-
-    alpha = pyro.param("alpha").item()
-    beta  = pyro.param("beta").item()
+    alpha = pyro.param("alpha").detach().squeeze(-1)
+    beta  = pyro.param("beta").detach().squeeze(-1)
     est_p = alpha / (alpha + beta)
-    return alpha, beta, est_p
+    return alpha, beta, est_p, fit
 
 def main() :
 
@@ -58,11 +62,28 @@ def main() :
     # 2. Tiny Pyro job
     # ---------------------------------------------------------------------
     print("Running Beta–Bernoulli demo…")
-    a, b, p_hat = beta_bernoulli_demo()
-    print(f"\nPosterior alpha={a:.2f}, beta={b:.2f} → mean={p_hat:.3f}")
+    # enough coin flips and steps for every chain to settle near 0.7
+    alphas, betas, p_hats, _ = beta_bernoulli_demo(num_obs=500, num_chains=4,
+                                                   num_steps=600, log_every=200)
+    print()
+    for a, b, p_hat in zip(alphas.tolist(), betas.tolist(), p_hats.tolist()):
+        print(f"Posterior alpha={a:.2f}, beta={b:.2f} → mean={p_hat:.3f}")
 
-    # Simple sanity check: recovered p should be within 0.1 of true 0.7
-    assert math.isclose(p_hat, 0.7, abs_tol=0.1), "Pyro inference looks wrong!"
+    # Simple sanity check: each chain should recover p within 0.1 of true 0.7
+    assert torch.allclose(p_hats, torch.tensor(0.7), atol=0.1), "Pyro inference looks wrong!"
+    print()
+
+    # ---------------------------------------------------------------------
+    # 3. SVI step timing, eager vs. compiled ELBO
+    # ---------------------------------------------------------------------
+    print("=== SVI step time ===")
+    for jit in (False, True):
+        *_, fit = beta_bernoulli_demo(num_chains=4, num_steps=200,
+                                      log_every=None, jit=jit)
+        # the first step of the compiled mode includes tracing, report it apart
+        first, rest = fit["step_times"][0], fit["step_times"][1:]
+        print(f"{fit['mode']:<10} : {1e3 * sum(rest) / len(rest):.3f} ms/step "
+              f"(first step {1e3 * first:.1f} ms)")
 
     print("\n✅  Environment looks good — container is ready for AutoGen.\n")
 
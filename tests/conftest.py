@@ -0,0 +1,31 @@
+import pyarrow.parquet as pq
+import pytest
+
+from trajpyro.generator.markov import generate
+
+CONFIG = {
+    "seed": 0,
+    "num_individuals": 200,
+    "birth_years": [1940, 2000],
+    "end_year": 2020,
+    "transitions": {
+        "inactivity": {"inactivity": 0.80, "employment": 0.15, "retirement": 0.0, "death": 0.05},
+        "employment": {"inactivity": 0.10, "employment": 0.80, "retirement": 0.08, "death": 0.02},
+        "retirement": {"retirement": 0.90, "death": 0.10},
+    },
+}
+
+@pytest.fixture(scope="session")
+def generated(tmp_path_factory):
+    """Paths of a small simulated data set, written in several row groups."""
+    out_dir = tmp_path_factory.mktemp("generated")
+    individuals_path, careers_path = generate(CONFIG, out_dir, chunk_size=64)
+    return individuals_path, careers_path
+
+@pytest.fixture(scope="session")
+def careers(generated):
+    return pq.read_table(generated[1]).to_pandas()
+
+@pytest.fixture(scope="session")
+def individuals(generated):
+    return pq.read_table(generated[0]).to_pandas()
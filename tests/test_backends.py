@@ -0,0 +1,72 @@
+from types import SimpleNamespace
+
+from trajpyro.agents.backends import GithubBackend, LocalBackend
+
+# ---------------------------------------------------------------------------
+# GitHub issue cache --------------------------------------------------------
+# ---------------------------------------------------------------------------
+
+class FakeIssue:
+    def __init__(self, number, log):
+        self.number, self.title, self.body, self.state = number, "title", "body", "open"
+        self.labels = [SimpleNamespace(name="bug")]
+        self._log = log
+
+    def update(self):
+        self._log.append(("update", self.number))
+
+class FakeRepo:
+    def __init__(self):
+        self.log = []
+
+    def get_issue(self, number):
+        self.log.append(("get_issue", number))
+        return FakeIssue(number, self.log)
+
+    def get_issues(self, **filters):
+        self.log.append(("get_issues", filters["state"]))
+        return iter([FakeIssue(1, self.log), FakeIssue(2, self.log)])
+
+def backend(ttl):
+    github = GithubBackend("owner/project")
+    github.__dict__["_connection"] = FakeRepo()  # skips the lazy connection
+    github.ttl = ttl
+    return github, github.repo.log
+
+def test_reads_within_ttl_make_no_request():
+    github, log = backend(ttl=60)
+    github.list_issues("all")
+    github.get_issue(1)
+    github.get_issue(3)
+    github.get_issue(3)
+    assert log == [("get_issues", "all"), ("get_issue", 3)]
+
+def test_listed_issues_are_fetched_again_not_revalidated():
+    # a listed issue carries the listing's ETag: If-None-Match would never match
+    github, log = backend(ttl=-1)
+    github.list_issues("all")
+    github.get_issue(1)
+    assert log == [("get_issues", "all"), ("get_issue", 1)]
+
+def test_fetched_issues_are_revalidated():
+    github, log = backend(ttl=-1)
+    github.get_issue(1)
+    github.get_issue(1)
+    assert log == [("get_issue", 1), ("update", 1)]
+
+# ---------------------------------------------------------------------------
+# Local backend -------------------------------------------------------------
+# ---------------------------------------------------------------------------
+
+def test_local_backend_persists_issues(tmp_path):
+    path = tmp_path / "github.json"
+    local = LocalBackend(path)
+    number = local.create_issue("title", "body")
+    local.add_label(number, "scheduled")
+    local.comment_issue(number, "hello")
+
+    reloaded = LocalBackend(path)
+    assert reloaded.list_issues("open", label="scheduled")[0]["number"] == number
+    issue, = reloaded.get_issues([number])
+    assert issue["labels"] == ["scheduled"]
+    assert [c["body"] for c in issue["comments"]] == ["hello"]
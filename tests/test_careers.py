@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from trajpyro.data.careers import _id_units, iter_tables
+
+def _check_batches(batches, careers, individuals, batch_size):
+    seen = []
+    for batch_careers, batch_individuals, ids in batches:
+        assert 0 < len(ids) <= batch_size
+        expected = careers[careers["id"].isin(ids)].reset_index(drop=True)
+        pd.testing.assert_frame_equal(batch_careers, expected, check_categorical=False)
+        assert batch_individuals["id"].tolist() == ids.tolist()
+        seen.append(ids)
+    seen = np.concatenate(seen)
+    assert sorted(seen) == sorted(np.unique(careers["id"]))
+    return seen
+
+@pytest.mark.parametrize("shuffle", [False, True])
+def test_iter_tables_reads_row_groups(generated, careers, individuals, shuffle):
+    individuals_path, careers_path = generated
+    assert len(_id_units(pq.ParquetFile(careers_path))) > 1
+    batches = iter_tables(careers_path, 50, individuals_path, shuffle=shuffle, seed=0)
+    seen = _check_batches(batches, careers, individuals, 50)
+    assert (list(seen) == sorted(seen)) != shuffle
+
+def test_iter_tables_ids_split_across_row_groups(careers, individuals, tmp_path):
+    path = tmp_path / "careers.parquet"
+    pq.write_table(pa.Table.from_pandas(careers, preserve_index=False), path, row_group_size=100)
+    assert pq.ParquetFile(path).metadata.num_row_groups > len(_id_units(pq.ParquetFile(path)))
+    individuals_path = tmp_path / "individuals.parquet"
+    individuals.to_parquet(individuals_path)
+    _check_batches(iter_tables(path, 30, individuals_path, seed=1), careers, individuals, 30)
+
+def test_iter_tables_unsorted_file(careers, individuals, tmp_path):
+    path = tmp_path / "careers.parquet"
+    shuffled = careers.sample(frac=1, random_state=0)
+    pq.write_table(pa.Table.from_pandas(shuffled, preserve_index=False), path, row_group_size=100)
+    assert _id_units(pq.ParquetFile(path)) is None
+    individuals_path = tmp_path / "individuals.parquet"
+    individuals.to_parquet(individuals_path)
+    batches = [
+        (c.sort_values(["id", "year"], ignore_index=True), i, ids)
+        for c, i, ids in iter_tables(path, 30, individuals_path, shuffle=False)
+    ]
+    _check_batches(batches, careers, individuals, 30)
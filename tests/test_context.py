@@ -0,0 +1,89 @@
+import asyncio
+
+from autogen_core import FunctionCall
+from autogen_core.models import (
+    AssistantMessage,
+    FunctionExecutionResult,
+    FunctionExecutionResultMessage,
+    UserMessage,
+)
+
+from trajpyro.agents.context import CompactingChatCompletionContext
+
+def _messages(context, messages):
+    async def run():
+        for message in messages:
+            await context.add_message(message)
+        return await context.get_messages()
+    return asyncio.run(run())
+
+def _tool_turn(call_ids, size):
+    calls = [FunctionCall(id=i, name="read_file", arguments="{}") for i in call_ids]
+    results = [
+        FunctionExecutionResult(content="x" * size, name="read_file", call_id=i, is_error=False)
+        for i in call_ids
+    ]
+    return [AssistantMessage(content=calls, source="coder"), FunctionExecutionResultMessage(content=results)]
+
+def _size(messages):
+    return sum(len(str(m.content)) for m in messages) // 4
+
+def test_old_tool_results_are_shortened():
+    history = [UserMessage(content="task", source="user")]
+    for i in range(10):
+        history += _tool_turn([str(i)], 5_000)
+    messages = _messages(CompactingChatCompletionContext(token_budget=32_000, keep_recent=2), history)
+    assert len(messages) == len(history)
+    assert len(messages[2].content[0].content) < 2_200
+    assert len(messages[-1].content[0].content) == 5_000
+
+def test_last_turn_survives_when_it_exceeds_the_budget():
+    history = [UserMessage(content="task", source="user")]
+    history += _tool_turn(["a"], 10_000)
+    history += _tool_turn(["b", "c", "d", "e"], 32_000)  # parallel calls, ~32k tokens
+    messages = _messages(CompactingChatCompletionContext(token_budget=32_000), history)
+
+    assert messages[0].content == "task"
+    assert messages[-2] == history[-2]  # the calls
+    results = messages[-1]
+    assert isinstance(results, FunctionExecutionResultMessage)
+    assert [r.call_id for r in results.content] == ["b", "c", "d", "e"]
+    assert all(0 < len(r.content) < 32_000 for r in results.content)
+    assert _size(messages) <= 32_000
+
+def test_dropping_keeps_calls_and_results_paired():
+    history = [UserMessage(content="task", source="user")]
+    for i in range(20):
+        history += _tool_turn([str(i)], 1_500)
+    messages = _messages(CompactingChatCompletionContext(token_budget=2_000, keep_recent=2), history)
+
+    assert "dropped" in messages[1].content
+    assert isinstance(messages[2], AssistantMessage)
+    assert messages[-2:] == history[-2:]
+    for call, result in zip(messages[2::2], messages[3::2]):
+        assert call.content[0].id == result.content[0].call_id
+
+def test_large_recent_message_is_shortened_not_dropped():
+    # as in the selector context, where tool summaries are user messages
+    history = [UserMessage(content="task", source="user")]
+    history += [UserMessage(content=f"turn {i}", source="manager") for i in range(3)]
+    history += [UserMessage(content="y" * 100_000, source="coder")]
+    messages = _messages(CompactingChatCompletionContext(token_budget=8_000, max_chars=500), history)
+
+    assert messages[-1].source == "coder"
+    assert 0 < len(messages[-1].content) < 100_000
+    assert _size(messages) <= 8_000
+
+def test_messages_after_an_old_tool_call_can_be_dropped():
+    # a manager that called a tool early on, then only talked
+    history = [UserMessage(content="task", source="user")]
+    history += _tool_turn(["a"], 1_000)
+    history += [AssistantMessage(content=f"{i} " + "z" * 3_000, source="manager") for i in range(80)]
+    messages = _messages(CompactingChatCompletionContext(token_budget=32_000), history)
+
+    assert _size(messages) <= 32_000
+    assert messages[1:3] == history[1:3]  # the tool call and its result
+    assert "dropped" in messages[3].content
+    kept = [int(m.content.split()[0]) for m in messages[4:]]
+    assert kept == list(range(80 - len(kept), 80))  # the most recent ones
+    assert messages[-1] == history[-1]
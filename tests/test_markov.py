@@ -0,0 +1,30 @@
+import pytest
+import torch
+
+from trajpyro.data.careers import state_matrix
+from trajpyro.data.spells import convert_careers
+from trajpyro.modeler.markov import count_transitions, transition_counts
+
+def test_transition_counts():
+    states = torch.tensor([
+        [0, 0, 1, 1, 3],
+        [1, -1, 1, 2, 2],   # no transition across a missing year
+        [2, 3, -1, -1, -1],  # nor after death
+    ], dtype=torch.int8)
+    expected = torch.zeros(4, 4, dtype=torch.long)
+    expected[0, 0] = expected[0, 1] = expected[1, 3] = 1
+    expected[1, 1] = expected[1, 2] = expected[2, 2] = expected[2, 3] = 1
+    assert torch.equal(transition_counts(states), expected)
+
+@pytest.mark.parametrize("batch_size", [16, 10_000])
+def test_count_transitions_by_batch(generated, careers, individuals, batch_size):
+    individuals_path, careers_path = generated
+    expected = transition_counts(state_matrix(careers, individuals))
+    assert torch.equal(count_transitions(careers_path, individuals_path, batch_size), expected)
+
+def test_count_transitions_of_spells(generated, careers, individuals, tmp_path):
+    individuals_path, careers_path = generated
+    spells_path = tmp_path / "spells.parquet"
+    convert_careers(careers_path, spells_path)
+    expected = transition_counts(state_matrix(careers, individuals))
+    assert torch.equal(count_transitions(spells_path, individuals_path, batch_size=16), expected)
@@ -0,0 +1,43 @@
+import pytest
+from autogen_agentchat.messages import TextMessage, ToolCallSummaryMessage
+
+from trajpyro.agents.selection import select_speaker
+
+def text(source, content):
+    return TextMessage(source=source, content=content)
+
+def test_user_task_goes_to_manager():
+    assert select_speaker([]) == "manager"
+    assert select_speaker([text("user", "Fix the coder's bug")]) == "manager"
+
+@pytest.mark.parametrize("content, expected", [
+    ("coder: implement the Markov model", "coder"),
+    ("**Tester**, please add a test for the spells", "tester"),
+    ("Next step.\n- coder: write the loader", "coder"),
+    ("@tester run the suite", "tester"),
+    ("I assign issue #3 to the coder.", "coder"),
+    ("Handing this over to the tester", "tester"),
+])
+def test_manager_assigns_one_team_mate(content, expected):
+    assert select_speaker([text("user", "task"), text("manager", content)]) == expected
+
+@pytest.mark.parametrize("content", [
+    "The coder's last change broke the build",
+    "Once the tester has looked at it, we will merge",
+    "coder: write the loader. tester: test it",
+    "@coder and @tester, sync up",
+])
+def test_bare_mentions_and_several_team_mates_leave_it_to_the_model(content):
+    assert select_speaker([text("user", "task"), text("manager", content)]) is None
+
+def test_manager_keeps_the_floor_without_mention():
+    assert select_speaker([text("user", "task"), text("manager", "Let me read the issues first")]) == "manager"
+
+def test_assignee_keeps_the_floor_until_done():
+    history = [text("user", "task"), text("manager", "coder: fix #2")]
+    assert select_speaker(history + [text("coder", "Working on it")]) == "coder"
+    assert select_speaker(history + [text("coder", "Fixed and pushed. DONE")]) == "manager"
+
+def test_tool_call_leaves_the_floor_to_its_caller():
+    summary = ToolCallSummaryMessage(source="tester", content="3 passed", tool_calls=[], results=[])
+    assert select_speaker([text("user", "task"), summary]) == "tester"
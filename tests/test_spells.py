@@ -0,0 +1,51 @@
+import pandas as pd
+import pyarrow.parquet as pq
+import torch
+
+from trajpyro.data.careers import state_matrix
+from trajpyro.data.spells import convert_careers, from_spells, to_spells
+from trajpyro.modeler.markov import spell_transition_counts, transition_counts
+
+def test_spells_are_maximal_runs():
+    careers = pd.DataFrame({
+        "id": [1, 1, 1, 1, 1, 2, 2],
+        "year": [1990, 1991, 1992, 1994, 1995, 1990, 1991],
+        "state": pd.Categorical(["inactivity", "inactivity", "employment",
+                                 "employment", "employment", "employment", "employment"]),
+    })
+    spells = to_spells(careers)
+    # a gap (1993) splits a run even when the state does not change
+    assert spells[["id", "start_year", "end_year"]].values.tolist() == [
+        [1, 1990, 1991], [1, 1992, 1992], [1, 1994, 1995], [2, 1990, 1991],
+    ]
+    assert spells["state"].tolist() == ["inactivity", "employment", "employment", "employment"]
+
+def test_spells_round_trip(careers):
+    spells = to_spells(careers)
+    assert len(spells) < len(careers)
+    pd.testing.assert_frame_equal(
+        from_spells(spells),
+        careers.sort_values(["id", "year"]).reset_index(drop=True),
+        check_dtype=False,
+    )
+
+def test_convert_careers_across_batches(generated, tmp_path):
+    _, careers_path = generated
+    spells_path = tmp_path / "spells.parquet"
+    # batches far smaller than a career: ids are split across them
+    convert_careers(careers_path, spells_path, batch_size=7)
+    spells = pq.read_table(spells_path).to_pandas()
+    expected = to_spells(pq.read_table(careers_path).to_pandas())
+    pd.testing.assert_frame_equal(spells, expected, check_dtype=False, check_categorical=False)
+
+def test_state_matrix_from_spells(careers, individuals):
+    assert torch.equal(
+        state_matrix(to_spells(careers), individuals),
+        state_matrix(careers, individuals),
+    )
+
+def test_spell_transition_counts(careers, individuals):
+    counts = spell_transition_counts(to_spells(careers), individuals)
+    assert torch.equal(counts, transition_counts(state_matrix(careers, individuals)))
+    # the deaths of individuals are counted too
+    assert counts[:, -1].sum() > 0
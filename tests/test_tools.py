@@ -0,0 +1,208 @@
+import os
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from trajpyro.agents import tools
+from trajpyro.agents.tools import delete_line, edit_lines, insert_line, read_file
+
+@pytest.fixture
+def text_file(tmp_path):
+    path = tmp_path / "file.txt"
+    path.write_text("a\nb\nc\nd\n", encoding="utf-8")
+    return path
+
+def lines(path):
+    return path.read_text(encoding="utf-8").splitlines()
+
+# ---------------------------------------------------------------------------
+# edit_lines ----------------------------------------------------------------
+# ---------------------------------------------------------------------------
+
+def test_edits_refer_to_the_original_numbering(text_file):
+    edit_lines(str(text_file), [
+        {"op": "delete", "line": 0},
+        {"op": "replace", "line": 2, "text": "C"},
+        {"op": "insert", "line": 1, "text": "after a"},
+        {"op": "insert", "line": 4, "text": "end"},
+    ])
+    assert lines(text_file) == ["after a", "b", "C", "d", "end"]
+
+def test_multiline_text_inserts_several_lines(text_file):
+    edit_lines(str(text_file), [{"op": "replace", "line": 1, "text": "b1\nb2"}])
+    assert lines(text_file) == ["a", "b1", "b2", "c", "d"]
+
+def test_empty_text_gives_a_blank_line(text_file):
+    edit_lines(str(text_file), [
+        {"op": "replace", "line": 1, "text": ""},
+        {"op": "insert", "line": 3, "text": ""},
+    ])
+    assert lines(text_file) == ["a", "", "c", "", "d"]
+
+@pytest.mark.parametrize("edits, error", [
+    ([{"op": "delete", "line": 4}], IndexError),
+    ([{"op": "insert", "line": 5, "text": "x"}], IndexError),
+    ([{"op": "replace", "line": -1, "text": "x"}], IndexError),
+    ([{"op": "delete", "line": 1}, {"op": "replace", "line": 1, "text": "x"}], ValueError),
+    ([{"op": "replace", "line": 1}], ValueError),
+    ([{"op": "move", "line": 1}], ValueError),
+])
+def test_invalid_batches_leave_the_file_untouched(text_file, edits, error):
+    with pytest.raises(error):
+        edit_lines(str(text_file), edits)
+    assert lines(text_file) == ["a", "b", "c", "d"]
+
+def test_no_temporary_file_is_left(text_file):
+    edit_lines(str(text_file), [{"op": "delete", "line": 0}])
+    assert [p.name for p in text_file.parent.iterdir()] == ["file.txt"]
+
+def test_insert_line_and_delete_line(text_file):
+    insert_line(str(text_file), 1, "x")
+    assert lines(text_file) == ["a", "x", "b", "c", "d"]
+    delete_line(str(text_file), 0)
+    assert lines(text_file) == ["x", "b", "c", "d"]
+    with pytest.raises(IndexError):
+        delete_line(str(text_file), 4)
+
+# ---------------------------------------------------------------------------
+# read_file -----------------------------------------------------------------
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def long_file(tmp_path):
+    # 10 bytes per line, several read blocks in all
+    path = tmp_path / "long.txt"
+    path.write_text("".join(f"line {i:04d}\n" for i in range(3000)))
+    return path
+
+def test_read_whole_file(text_file):
+    assert read_file(str(text_file)) == text_file.read_text()
+
+def test_read_line_window(long_file):
+    assert read_file(str(long_file), start_line=10, end_line=12) == "line 0010\nline 0011\n"
+    assert read_file(str(long_file), end_line=2) == "line 0000\nline 0001\n"
+    assert read_file(str(long_file), start_line=2998) == "line 2998\nline 2999\n"
+
+def test_read_tail(long_file):
+    # 1000 lines span two read blocks
+    assert read_file(str(long_file), tail=1000) == "".join(f"line {i:04d}\n" for i in range(2000, 3000))
+    assert read_file(str(long_file), tail=0) == ""
+
+def test_read_byte_range(long_file):
+    text = read_file(str(long_file), byte_offset=20, max_bytes=10)
+    assert text.startswith("line 0002\n")
+    assert "showing bytes 20-30 of 30000" in text
+    assert read_file(str(long_file), byte_offset=29990) == "line 2999\n"
+
+def test_read_is_truncated_at_max_bytes(long_file):
+    head = read_file(str(long_file), max_bytes=25)
+    assert head.startswith("line 0000\nline 0001\nline ")
+    assert "truncated at line 2, byte limit 25 reached" in head
+    tail = read_file(str(long_file), tail=100, max_bytes=25)
+    assert tail.startswith("[... truncated, byte limit 25 reached")
+    assert tail.endswith("line 2998\nline 2999\n")
+
+# ---------------------------------------------------------------------------
+# tree ----------------------------------------------------------------------
+# ---------------------------------------------------------------------------
+
+GITIGNORE = """\
+# comment
+*.log
+!keep.log
+build/
+docs/*.md
+a/**/c
+/top.txt
+**/gen/*.py
+data?.csv
+[ab]x.txt
+"""
+
+FILES = [
+    "x.log", "keep.log", "d/y.log", "d/keep.log",
+    "build/o.txt", "d/build/o.txt",
+    "docs/r.md", "docs/sub/s.md", "docs/keep.txt",
+    "a/c", "a/b/c", "a/b/d/c", "a/x",
+    "top.txt", "d/top.txt",
+    "gen/m.py", "d/gen/m.py", "d/gen/sub/n.py",
+    "data1.csv", "data12.csv", "ax.txt", "cx.txt",
+    "d/z.tmp", "d/only.txt", "d/e/only.txt",
+]
+
+def test_tree_ignores_files_as_git_does(tmp_path):
+    subprocess.run(["git", "init", "-q", str(tmp_path)], check=True)
+    (tmp_path / ".gitignore").write_text(GITIGNORE)
+    (tmp_path / "d").mkdir()
+    (tmp_path / "d" / ".gitignore").write_text("*.tmp\n/only.txt\n")
+    for name in FILES:
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / name).write_text(name)
+
+    status = subprocess.run(
+        ["git", "status", "--porcelain", "--untracked-files=all"],
+        cwd=tmp_path, capture_output=True, text=True, check=True,
+    ).stdout
+    untracked = {line[3:] for line in status.splitlines() if line.startswith("?? ")}
+    walked = {
+        os.path.relpath(full_path, tmp_path)
+        for _, full_path, _, is_dir, _ in tools._walk(str(tmp_path), hidden=True)
+        if not is_dir
+    }
+    assert "docs/sub/s.md" in walked and "a/b/d/c" not in walked
+    assert walked == untracked
+
+def test_tree_sizes_follow_in_place_rewrites(tmp_path):
+    log = tmp_path / "run.out"
+    log.write_text("x")
+    assert tools.tree(str(tmp_path)) == "run.out (1 B)"
+    with open(log, "a") as f:  # the directory does not change
+        f.write("yyy")
+    assert tools.tree(str(tmp_path)) == "run.out (4 B)"
+
+# ---------------------------------------------------------------------------
+# search --------------------------------------------------------------------
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def source_tree(tmp_path, monkeypatch):
+    monkeypatch.setattr(tools, "_SEARCH_DIR", str(tmp_path / "cache"))
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "pkg" / "sub").mkdir(parents=True)
+    (tmp_path / "pkg" / "sub" / "mod.py").write_text("import os\n\ndef run_svi(model):\n    return model\n")
+    (tmp_path / "pkg" / "other.py").write_text("from .sub.mod import run_svi\n")
+    return tmp_path
+
+def test_search_paths_are_readable_from_the_working_directory(source_tree):
+    for path in ("pkg", "pkg/sub", "."):
+        result = tools.search("def run_svi", path, context=0)
+        shown, number, _ = result.split(":", 2)
+        assert read_file(shown, start_line=int(number) - 1, end_line=int(number)) == "def run_svi(model):\n"
+
+def test_search_symbol_and_context(source_tree):
+    assert tools.search("run_svi", "pkg", symbol=True, context=0) == "pkg/sub/mod.py:3:def run_svi(model):"
+    assert tools.search("run_svi", "pkg", context=1).splitlines() == [
+        "pkg/other.py:1:from .sub.mod import run_svi",
+        "--",
+        "pkg/sub/mod.py-2-",
+        "pkg/sub/mod.py:3:def run_svi(model):",
+        "pkg/sub/mod.py-4-    return model",
+    ]
+
+def test_search_sees_changed_files(source_tree):
+    assert tools.search("new_name", "pkg") == "No match"
+    (source_tree / "pkg" / "other.py").write_text("new_name = 1\n")
+    assert tools.search("new_name", "pkg", context=0) == "pkg/other.py:1:new_name = 1"
+
+def test_concurrent_searches(source_tree, monkeypatch):
+    # as AutoGen runs the tool calls of one turn: in threads, on a cold index
+    for i in range(200):
+        (source_tree / "pkg" / f"f{i}.py").write_text(f"value_{i} = {i}\n")
+    for attempt in range(5):
+        monkeypatch.setattr(tools, "_SEARCH_DIR", str(source_tree / f"cache{attempt}"))
+        tools._search_indexes.clear()
+        with ThreadPoolExecutor(4) as pool:
+            results = list(pool.map(lambda q: tools.search(q, "pkg", context=0),
+                                    ["value_1 ", "value_2 ", "run_svi", "value_199"]))
+        assert results[3] == "pkg/f199.py:1:value_199 = 199"